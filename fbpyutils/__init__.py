@@ -13,7 +13,7 @@ from dotenv import load_dotenv
 _ = load_dotenv()  # take environment variables from .env.
 
 _ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
-_APP_CONFIG_FILE = os.path.sep.join([_ROOT_DIR, "app.json"])
+_APP_CONFIG_FILE = os.path.join(_ROOT_DIR, "app.json")
 
 # Variáveis globais para armazenar as instâncias singleton
 _env_instance: Optional[Env] = None
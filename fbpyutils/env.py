@@ -90,8 +90,7 @@ class Env:
         self.CONFIG = parsed_config.config
 
         # Ensure USER_APP_FOLDER exists
-        if not os.path.exists(self.USER_APP_FOLDER):
-            os.makedirs(self.USER_APP_FOLDER)
+        os.makedirs(self.USER_APP_FOLDER, exist_ok=True)
         
         self._initialized = True
 
@@ -65,7 +65,7 @@ class Logger:
         
         # Only use file logging if explicitly configured
         if config_dict:
-            log_file_path = config_dict.get("log_file_path", os.path.sep.join(["~", ".fbpyutils", "logs", "app.log"]))
+            log_file_path = config_dict.get("log_file_path", os.path.join("~", ".fbpyutils", "logs", "app.log"))
             log_file_path = os.path.expanduser(log_file_path)
             log_handlers = config_dict.get("log_handlers", ["file", "console"])
         else:
@@ -89,8 +89,8 @@ class Logger:
             if log_file_path:
                 try:
                     log_dir = os.path.dirname(log_file_path)
-                    if log_dir and not os.path.exists(log_dir):
-                        os.makedirs(log_dir)
+                    if log_dir:
+                        os.makedirs(log_dir, exist_ok=True)
                     
                     file_handler = ConcurrentRotatingFileHandler(
                         log_file_path,
@@ -15,15 +15,26 @@ Classes:
 """
 
 import os
+import re
 import time
+import array
+import bisect
 import pickle
-import inspect
+import sqlite3
+import hashlib
+import threading
+import traceback
+import functools
+import weakref
 import multiprocessing
 import uuid
+import itertools
 import concurrent.futures
 
-from typing import Any, Callable, List, Tuple, Dict, Optional, TypeVar, Protocol
+from contextlib import closing
 from datetime import datetime
+from multiprocessing import resource_tracker, shared_memory
+from typing import Any, Callable, Container, List, NamedTuple, Tuple, Dict, FrozenSet, Optional, TypeVar, Protocol, BinaryIO, Iterable, Iterator, Union
 
 from fbpyutils import get_env, get_logger
 from fbpyutils.string import hash_string
@@ -34,13 +45,188 @@ _logger = get_logger()
 # Type variable for generic processing function
 T = TypeVar('T')
 
+@functools.lru_cache(maxsize=128)
+def _function_info(func_id: int, module: str, qualname: str) -> Dict[str, str]:
+    """Builds the `Process.get_function_info` dictionary, cached per function identity and name."""
+    return {
+        'id': str(func_id),
+        'module': module,
+        'name': qualname,
+        'full_ref': f"{module}.{qualname}",
+        'unique_ref': f"{module}.{qualname}_{func_id}"
+    }
+
+@functools.lru_cache(maxsize=4)
+def _parallel_type_available(parallel_type: str) -> bool:
+    """Checks, once per parallel type, if it is supported. See `Process.is_parallelizable`."""
+    if parallel_type == 'processes':
+        try:
+            import multiprocessing  # Import here to avoid global namespace pollution
+            return True
+        except ImportError:
+            return False
+    return parallel_type == 'threads'
+
+def _call(func: Callable, params: Tuple[Any, ...]) -> Any:
+    """Calls `func` with the unpacked `params`. Module level so executors can pickle it by name."""
+    return func(*params)
+
+class _SizedIterable:
+    """
+    Single-pass iterable of known length.
+
+    Lets the controlled runs hand `Process.run`, which sizes the batch with `len`, a
+    generator of task tuples instead of a second list holding every one of them.
+    """
+
+    __slots__ = ('_iterable', '_size')
+
+    def __init__(self, iterable: Iterable[Any], size: int) -> None:
+        self._iterable: Iterable[Any] = iterable
+        self._size: int = size
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self._iterable)
+
+# Out-of-band buffers smaller than this are cheaper to send through the executor pipe
+_SHARED_BUFFERS_MIN_SIZE = 64 * 1024
+
+class _OutOfBandBytes:
+    """Stands for a large bytes or bytearray object so that pickle sends its data out-of-band."""
+
+    __slots__ = ('data',)
+
+    def __init__(self, data: Union[bytes, bytearray]) -> None:
+        self.data: Union[bytes, bytearray] = data
+
+    def __reduce_ex__(self, protocol: int) -> Any:
+        return type(self.data), (pickle.PickleBuffer(self.data),)
+
+class _SharedBuffers:
+    """
+    Pickle protocol 5 payload whose out-of-band buffers travel in shared memory.
+
+    Bytes-like objects exposing the buffer protocol (bytearrays, numpy arrays, ...)
+    are copied once into a shared memory block instead of being serialized into the
+    executor pipe. The receiving process rebuilds the object and removes the block.
+    """
+
+    def __init__(self, data: bytes, buffers: List[pickle.PickleBuffer], size: int) -> None:
+        self._data: bytes = data
+        self._spans: List[Tuple[int, int]] = []
+        shm = shared_memory.SharedMemory(create=True, size=size)
+        try:
+            offset = 0
+            for buffer in buffers:
+                with buffer.raw() as raw:
+                    shm.buf[offset:offset + raw.nbytes] = raw
+                    self._spans.append((offset, offset + raw.nbytes))
+                    offset += raw.nbytes
+        finally:
+            shm.close()
+        self._name: str = shm.name
+
+    @staticmethod
+    def _is_large_bytes(obj: Any) -> bool:
+        # Pickle keeps bytes and bytearrays in-band: they go out-of-band through _OutOfBandBytes
+        return type(obj) in (bytes, bytearray) and len(obj) >= _SHARED_BUFFERS_MIN_SIZE
+
+    @staticmethod
+    def wrap(obj: Any) -> Any:
+        """
+        Moves the out-of-band buffers of `obj` to shared memory when worth it.
+
+        Only tuples with a top-level array-like or large bytes or bytearray item are considered.
+
+        Args:
+            obj (Any): Task parameters or processing result.
+
+        Returns:
+            Any: A `_SharedBuffers` payload, or `obj` itself if it has no large buffers.
+        """
+        if os.name != 'posix' or not isinstance(obj, tuple) or not any(
+                hasattr(x, '__array_interface__') or _SharedBuffers._is_large_bytes(x) for x in obj):
+            return obj
+        buffers: List[pickle.PickleBuffer] = []
+        data = pickle.dumps(
+            tuple(_OutOfBandBytes(x) if _SharedBuffers._is_large_bytes(x) else x for x in obj),
+            protocol=5, buffer_callback=buffers.append)
+        size = sum(b.raw().nbytes for b in buffers)
+        if size < _SHARED_BUFFERS_MIN_SIZE:
+            return obj
+        return _SharedBuffers(data, buffers, size)
+
+    @staticmethod
+    def unwrap(obj: Any) -> Any:
+        """Rebuilds the object held by a `_SharedBuffers` payload. Other objects are returned as is."""
+        if not isinstance(obj, _SharedBuffers):
+            return obj
+        shm = shared_memory.SharedMemory(name=obj._name)
+        try:
+            buffers = [bytearray(shm.buf[start:end]) for start, end in obj._spans]
+        finally:
+            shm.close()
+            shm.unlink()
+        return pickle.loads(obj._data, buffers=buffers)
+
+    @staticmethod
+    def discard(obj: Any) -> None:
+        """Removes the block of a `_SharedBuffers` payload that will not be unwrapped. Other objects are ignored."""
+        if isinstance(obj, _SharedBuffers):
+            shm = shared_memory.SharedMemory(name=obj._name)
+            shm.close()
+            shm.unlink()
+
+class _TaskError:
+    """Exception raised by a task in a worker process, returned by `_call_shared` instead of raised."""
+
+    __slots__ = ('exception',)
+
+    def __init__(self, exception: Exception) -> None:
+        self.exception: Exception = exception
+
+def _call_shared(func: Callable, params: Any) -> Any:
+    """
+    Like `_call`, exchanging large buffers of parameters and result through shared memory.
+
+    A task that raises returns a `_TaskError` holding the exception, with the worker's
+    traceback as a note. The other tasks of its chunk still run, so every block the
+    chunk was sent is consumed and every block it creates reaches the parent process.
+    """
+    try:
+        return _SharedBuffers.wrap(func(*_SharedBuffers.unwrap(params)))
+    except Exception as e:
+        e.add_note(traceback.format_exc())
+        return _TaskError(e)
+
+def _shared_result(obj: Any) -> Any:
+    """Rebuilds a `_call_shared` result, raising the exception of a failed task."""
+    if isinstance(obj, _TaskError):
+        raise obj.exception
+    return _SharedBuffers.unwrap(obj)
+
+class ProcessResult(NamedTuple):
+    """
+    Result of a processing function: success status, optional error message and result.
+
+    Any plain 3-tuple in the same order is accepted as well.
+    """
+    success: bool
+    message: Optional[str]
+    result: Any
+
 class ProcessingFunction(Protocol):
     """
     Defines the protocol for a generic processing function.
 
     A processing function should accept a tuple of parameters and return a tuple
     containing a boolean indicating success, an optional error message (string),
-    and a result of any type.
+    and a result of any type, preferably as a `ProcessResult`. Session controlled
+    runs unpack exactly these three fields on their fast path; other tuple lengths
+    are still accepted through a slower fallback.
     """
     def __call__(self, params: Tuple[Any, ...]) -> Tuple[bool, Optional[str], Any]:
         """
@@ -106,12 +292,12 @@ class Process:
     sleeptime: float
     _parallel_type: str
 
-    @staticmethod
-    def _process_wrapper(func_and_params):
-        func, params = func_and_params
-        return func(*params)
-
-    _MAX_WORKERS = os.cpu_count() if os.name == 'nt' else 1
+    # Default number of workers: the CPUs this process may run on (honouring affinity
+    # masks set by taskset or cgroups) where the platform reports them, else all CPUs
+    try:
+        _MAX_WORKERS = len(os.sched_getaffinity(0))
+    except AttributeError:
+        _MAX_WORKERS = os.cpu_count() or 1
 
     @staticmethod
     def get_available_cpu_count() -> int:
@@ -158,20 +344,17 @@ class Process:
         Raises:
             ValueError: If an invalid parallel_type is provided.
         """
+        available = _parallel_type_available(parallel_type)
         if parallel_type == 'processes':
-            try:
-                import multiprocessing  # Import here to avoid global namespace pollution
+            if available:
                 _logger.info("Multiprocessing parallelization available")
-                return True
-            except ImportError:
-                _logger.error(f"Multiprocessing not available: {__file__}:{inspect.currentframe().f_lineno}")
-                return False
+            else:
+                _logger.error("Multiprocessing not available")
         elif parallel_type == 'threads':
             _logger.info("Default multi-threads parallelization available")
-            return True
         else:
             _logger.warning(f"Unknown parallel type: {parallel_type}. Assuming not parallelizable.")
-            return False
+        return available
 
     @staticmethod
     def get_function_info(func: Callable) -> Dict[str, str]:
@@ -202,13 +385,7 @@ class Process:
             The 'unique_ref' can be used to distinguish between different instances
             of the same function in memory.
         """
-        return {
-            'id': str(id(func)),
-            'module': func.__module__,
-            'name': func.__qualname__,
-            'full_ref': f"{func.__module__}.{func.__qualname__}",
-            'unique_ref': f"{func.__module__}.{func.__qualname__}_{id(func)}"
-        }
+        return dict(_function_info(id(func), func.__module__, func.__qualname__))
 
     def __init__(self, process: Callable[..., ProcessingFunction], parallelize: bool = True,
                  workers: Optional[int] = _MAX_WORKERS, sleeptime: float = 0,
@@ -232,22 +409,68 @@ class Process:
             ValueError: If an invalid parallel_type is provided.
         """
         parallel_type = parallel_type or 'threads'
-        if parallel_type not in ('threads', 'processes'): # Corrected typo 'process' to 'processes'
-            raise ValueError(f'Invalid parallel processing type: {parallel_type}. Valid types are: threads or processes.')
-        self._process: Callable = process
-        self._parallel_type: str = parallel_type
-        _logger.debug(f"Initializing Process with parallelize={parallelize}, workers={workers}, sleeptime={sleeptime}, parallel_type={parallel_type}")
         if parallel_type not in ('threads', 'processes'): # Corrected typo 'process' to 'processes'
             _logger.error(f"Invalid parallel processing type: {parallel_type}. Valid types are: threads or processes.")
             raise ValueError(f'Invalid parallel processing type: {parallel_type}. Valid types are: threads or processes.')
+        _logger.debug(f"Initializing Process with parallelize={parallelize}, workers={workers}, sleeptime={sleeptime}, parallel_type={parallel_type}")
         self._process: Callable = process
         self._parallel_type: str = parallel_type
-        self._parallelize: bool = parallelize and Process.is_parallelizable(parallel_type=self._parallel_type)
+        self._parallelize: bool = parallelize and _parallel_type_available(self._parallel_type)
         self._workers: int = workers or Process._MAX_WORKERS # Ensured _workers is always int
         self.sleeptime: float = 0 if sleeptime < 0 else sleeptime
+        self._executor: Optional[concurrent.futures.Executor] = None
+        self._executor_finalizer: Optional[weakref.finalize] = None
         _logger.info(f"Process initialized: parallel={self._parallelize}, type={self._parallel_type}, workers={self._workers}")
 
-    def run(self, params: List[Tuple[Any, ...]]) -> List[Tuple[bool, Optional[str], Any]]:
+    def __enter__(self) -> 'Process':
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # The executor stays with the instance that created it
+        state = self.__dict__.copy()
+        state['_executor'] = None
+        state['_executor_finalizer'] = None
+        return state
+
+    def close(self) -> None:
+        """
+        Shuts down the worker pool kept by parallel runs, waiting for running tasks to finish.
+
+        The pool is created by the first parallel run and reused by the following ones.
+        It is also shut down when the instance is garbage collected, or on leaving a
+        `with` block. A later run creates a new pool.
+        """
+        if self._executor_finalizer is not None:
+            self._executor_finalizer()
+        self._executor = None
+        self._executor_finalizer = None
+
+    def _get_executor(self, max_workers: int) -> concurrent.futures.Executor:
+        """
+        Returns the worker pool of the instance, creating it on first use.
+
+        Args:
+            max_workers (int): The number of workers of a new pool.
+
+        Returns:
+            concurrent.futures.Executor: A ProcessPoolExecutor or a ThreadPoolExecutor, according to parallel_type.
+        """
+        if self._executor is None:
+            if self._parallel_type == 'processes' and os.name == 'posix':
+                # Workers share the resource tracker of this process when it runs before they
+                # start, so the shared memory blocks created on one side and removed on the
+                # other are not reported as leaked
+                resource_tracker.ensure_running()
+            executor_class = concurrent.futures.ProcessPoolExecutor if self._parallel_type == 'processes' else concurrent.futures.ThreadPoolExecutor
+            self._executor = executor_class(max_workers=max_workers)
+            self._executor_finalizer = weakref.finalize(self, self._executor.shutdown)
+            _logger.debug("Created %s with %d workers.", executor_class.__name__, max_workers)
+        return self._executor
+
+    def run(self, params: List[Tuple[Any, ...]], chunksize: Optional[int] = None) -> List[Tuple[bool, Optional[str], Any]]:
         """
         Executes the processing function for each parameter set in the given list.
 
@@ -256,6 +479,12 @@ class Process:
         Args:
             params (List[Tuple[Any, ...]]): List of parameter tuples. Each tuple contains the arguments
                                              to be passed to the processing function.
+            chunksize (Optional[int]): Number of parameter sets sent to a worker process at once when
+                                       parallel_type is 'processes'. Larger chunks cut the pickling and
+                                       IPC round-trips per task. If None, defaults to
+                                       len(params) // (workers * 4), at least 1. Use 1 when task
+                                       durations vary widely, so slow tasks are not batched together.
+                                       Ignored by the threads executor and in serial mode.
 
         Returns:
             List[Tuple[bool, Optional[str], Any]]: List of processing results. Each tuple in the list
@@ -266,45 +495,195 @@ class Process:
 
         Raises:
             Exception: Any exception raised during the execution of the processing function.
+                       With parallel_type 'processes', the first one is raised once every
+                       task of the batch has run.
 
         Note:
             When running in parallel mode, the order of results may not match the order of input parameters
             due to the nature of concurrent execution.
         """
+        try:
+            return self._run_with(self._process, params, chunksize)
+        except Exception as e:
+            _logger.error("Error in process execution: %s", e, exc_info=True)
+            raise
+
+    def _run_with(self, func: Callable, params: Iterable[Tuple[Any, ...]],
+                  chunksize: Optional[int] = None) -> List[Any]:
+        """
+        Runs `func` for each parameter set, as `run` does for the processing function.
+
+        Subclasses use it to dispatch their control wrappers without swapping the
+        instance's processing function, so concurrent runs of an instance are safe.
+
+        Args:
+            func (Callable): The function to call with each parameter tuple.
+            params (Iterable[Tuple[Any, ...]]): Parameter tuples, sized with `len`.
+            chunksize (Optional[int]): See `run`.
+
+        Returns:
+            List[Any]: The result of each call, or (False, error_message, None) for the
+                       calls that raised in serial mode.
+        """
+        return list(self._iter_with(func, params, chunksize))
+
+    def _iter_with(self, func: Callable, params: Iterable[Tuple[Any, ...]],
+                   chunksize: Optional[int] = None) -> Iterator[Any]:
+        """
+        Like `_run_with`, yielding each result in the order of the parameters as soon as it is received.
+
+        Lets subclasses act on the results that arrived before a task raised. With
+        parallel_type 'processes', the results received after a failure are dropped
+        and the exception is raised once every task has run.
+        """
         _logger.info(f"Starting execution with {len(params)} parameter sets.")
-        responses: List[Tuple[bool, Optional[str], Any]] = []
         if not self._parallelize:
             _logger.info("Running in serial mode (parallelization disabled)")
             for i, param in enumerate(params):
-                _logger.debug(f"Processing item {i+1}/{len(params)} in serial mode.")
+                _logger.debug("Processing item %d/%d in serial mode.", i + 1, len(params))
                 try:
-                    responses.append(self._process(*param))
+                    response = func(*param)
                 except Exception as e:
                     _logger.error(f"Error processing item {i+1} in serial mode: {e}")
-                    responses.append((False, str(e), None)) # Ensure consistent return format
+                    response = (False, str(e), None) # Ensure consistent return format
+                yield response
                 if self.sleeptime > 0:
                     time.sleep(self.sleeptime)
             _logger.info("Finished serial execution.")
-            return responses
+            return
+
+        max_workers = self._resolve_workers()
+        _logger.info(f"Starting parallel execution with {max_workers} workers using {self._parallel_type}.")
+        chunksize = chunksize or max(1, len(params) // (max_workers * 4))
+        processed = 0
+        try:
+            executor = self._get_executor(max_workers)
+            if self._parallel_type == 'processes':
+                # Every result is received, even after a task failed, so no shared memory
+                # block is left behind; the first exception is raised at the end.
+                error: Optional[Exception] = None
+                for r in executor.map(_call_shared, itertools.repeat(func), map(_SharedBuffers.wrap, params),
+                                      chunksize=chunksize):
+                    if isinstance(r, _TaskError):
+                        error = error or r.exception
+                    elif error is None:
+                        processed += 1
+                        yield _SharedBuffers.unwrap(r)
+                    else:
+                        _SharedBuffers.discard(r)
+                if error is not None:
+                    raise error
+            else:
+                for r in executor.map(_call, itertools.repeat(func), params, chunksize=chunksize):
+                    processed += 1
+                    yield r
+            _logger.info(f"Processed {processed} items successfully in parallel.")
+        except Exception as e:
+            _logger.error("Error during parallel process execution: %s", e)
+            if isinstance(e, concurrent.futures.BrokenExecutor):
+                # A pool that lost a worker cannot be reused: the next run starts a new one
+                self.close()
+            raise
+
+    def run_iter(self, params: Iterable[Tuple[Any, ...]]) -> Iterator[Tuple[bool, Optional[str], Any]]:
+        """
+        Executes the processing function for each parameter set, yielding the results as they complete.
+
+        Unlike `run`, parameters are consumed lazily and results are not collected, so memory
+        use does not grow with the size of the batch: in parallel mode at most twice the number
+        of workers tasks are in flight at any time.
+
+        Args:
+            params (Iterable[Tuple[Any, ...]]): Parameter tuples, e.g. a list or a generator. Each
+                                                 tuple contains the arguments to be passed to the
+                                                 processing function.
+
+        Yields:
+            Tuple[bool, Optional[str], Any]: The result of each parameter set, as returned by the
+                                             processing function (see `run`).
+
+        Raises:
+            Exception: Any exception raised during the execution of the processing function in
+                       parallel mode.
+
+        Note:
+            In parallel mode results are yielded in completion order, not in the order of the
+            parameters. Closing the generator early cancels the tasks not started yet.
+        """
+        if not self._parallelize:
+            _logger.info("Streaming results in serial mode (parallelization disabled)")
+            for i, param in enumerate(params):
+                _logger.debug("Processing item %d in serial mode.", i + 1)
+                try:
+                    yield self._process(*param)
+                except Exception as e:
+                    _logger.error(f"Error processing item {i+1} in serial mode: {e}")
+                    yield (False, str(e), None)
+                if self.sleeptime > 0:
+                    time.sleep(self.sleeptime)
+            return
+
+        max_workers = self._resolve_workers()
+        _logger.info(f"Streaming results with {max_workers} workers using {self._parallel_type}.")
+        call, wrap = (_call_shared, _SharedBuffers.wrap) if self._parallel_type == 'processes' else (_call, None)
+        tasks = iter(params)
+        # In-flight futures, mapped to the (possibly wrapped) parameters they were submitted with
+        pending: Dict[concurrent.futures.Future, Any] = {}
+
+        def submit(executor: concurrent.futures.Executor) -> None:
+            # Submits the next parameter set, if any is left
+            for param in tasks:
+                param = wrap(param) if wrap else param
+                pending[executor.submit(call, self._process, param)] = param
+                return
+
+        executor = self._get_executor(max_workers)
+        try:
+            for _ in range(max_workers * 2):
+                submit(executor)
+            while pending:
+                done, _ = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+                for future in done:
+                    del pending[future]
+                    submit(executor)
+                    yield _shared_result(future.result())
+        except concurrent.futures.BrokenExecutor:
+            self.close()
+            raise
+        finally:
+            # Wait for the tasks left behind by an early exit and release their shared memory
+            for future, param in pending.items():
+                if future.cancel():
+                    _SharedBuffers.discard(param)
+                elif future.exception() is None:
+                    _SharedBuffers.discard(future.result())
+
+    def _resolve_workers(self) -> int:
+        """
+        Resolves the number of workers for a parallel run, bounded by the available CPU count.
 
+        Returns:
+            int: The number of workers to use.
+        """
         max_workers = self._workers or Process.get_available_cpu_count()
         if (max_workers < 1 or max_workers > Process.get_available_cpu_count()):
             _logger.warning(f"Requested workers ({max_workers}) out of bounds. Adjusting to available CPU count: {Process.get_available_cpu_count()}")
             max_workers = Process.get_available_cpu_count()
+        return max_workers
 
-        _logger.info(f"Starting parallel execution with {max_workers} workers using {self._parallel_type}.")
-        executor_class = concurrent.futures.ProcessPoolExecutor if self._parallel_type == 'processes' else concurrent.futures.ThreadPoolExecutor
-        try:
-            with executor_class(max_workers=max_workers) as executor:
-                if self._parallel_type == 'processes':
-                    responses = list(executor.map(Process._process_wrapper, [(self._process, p) for p in params]))
-                else:
-                    responses = list(executor.map(lambda x: self._process(*x), params))
-            _logger.info(f"Processed {len(responses)} items successfully in parallel.")
-            return responses
-        except Exception as e:
-            _logger.error(f"Error during parallel process execution: {str(e)} at {__file__}:{inspect.currentframe().f_lineno}")
-            raise
+
+# Processed files recorded in the control database per transaction, during a controlled run
+_CONTROL_DB_BATCH_SIZE = 64
+
+
+def _normalize_timestamp(ts: float) -> float:
+    """Rounds a file timestamp the way `fbpyutils.file.creation_date(...).timestamp()` does.
+
+    Control files written before the control database hold timestamps rounded to the
+    microsecond by `datetime`; comparing them with raw `os.stat` timestamps would take
+    unmodified files as modified.
+    """
+    return datetime.fromtimestamp(ts).timestamp()
 
 
 class FileProcess(Process):
@@ -315,8 +694,8 @@ class FileProcess(Process):
     based on file modification timestamps. It avoids unnecessary reprocessing
     of files that have not been modified since the last successful processing.
 
-    It uses a control file to track the last processing timestamp for each file,
-    stored in a dedicated folder within the application's user data directory.
+    It uses a control database (process_control.db, in the application's user data
+    directory) to track the last processing timestamp of each file per processing function.
 
     Methods:
         _controlled_run: Executes processing with timestamp control logic.
@@ -326,17 +705,147 @@ class FileProcess(Process):
         Process: Base class providing parallel/serial processing capabilities.
     """
 
+    @staticmethod
+    def _open_control_db() -> sqlite3.Connection:
+        """
+        Opens the process control database, creating it if needed.
+
+        The database keeps, for each processing function and file, the timestamp of the
+        file at its last successful processing. It lives in the application's user data
+        directory and runs in WAL mode so concurrent runs do not block each other's reads.
+
+        Returns:
+            sqlite3.Connection: An open connection to the control database.
+        """
+        os.makedirs(_env.USER_APP_FOLDER, exist_ok=True)
+        db = sqlite3.connect(os.path.join(_env.USER_APP_FOLDER, "process_control.db"))
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute("PRAGMA synchronous=NORMAL")
+        db.execute(
+            "CREATE TABLE IF NOT EXISTS file_control ("
+            "function_ref TEXT NOT NULL, file_hash TEXT NOT NULL, timestamp REAL NOT NULL, "
+            "PRIMARY KEY (function_ref, file_hash))"
+        )
+        return db
+
+    @staticmethod
+    def _record_processed(db: sqlite3.Connection, processed: List[Tuple[str, str, float]]) -> int:
+        """
+        Records processed files in the control database, in a single transaction.
+
+        Args:
+            db (sqlite3.Connection): The control database.
+            processed (List[Tuple[str, str, float]]): (function_ref, file_hash, timestamp) rows.
+
+        Returns:
+            int: The number of rows recorded.
+        """
+        if processed:
+            with db:
+                db.executemany(
+                    "INSERT OR REPLACE INTO file_control (function_ref, file_hash, timestamp) VALUES (?, ?, ?)",
+                    processed)
+        return len(processed)
+
+    @staticmethod
+    def _legacy_timestamps(function_ref: str, files: List[Tuple[str, str]]) -> Dict[str, float]:
+        """
+        Reads the timestamps recorded by the control files of earlier versions.
+
+        Earlier versions kept the pickled timestamp of each processed file in
+        `p_<function hash>.control/f_<file hash>.reg`, under the application's user data
+        directory. `run` moves the ones it finds to the control database, so files
+        processed before an upgrade are not processed again.
+
+        Args:
+            function_ref (str): Full reference of the processing function.
+            files (List[Tuple[str, str]]): (file_hash, file path) of the files missing from the database.
+
+        Returns:
+            Dict[str, float]: The recorded timestamps found, keyed by file hash.
+        """
+        control_folder = os.path.join(_env.USER_APP_FOLDER, f"p_{hash_string(function_ref)}.control")
+        try:
+            control_files = set(os.listdir(control_folder))
+        except (FileNotFoundError, NotADirectoryError):
+            return {}
+        timestamps: Dict[str, float] = {}
+        for file_key, file in files:
+            control_file = f"f_{hash_string(file)}.reg"
+            if control_file in control_files:
+                try:
+                    with open(os.path.join(control_folder, control_file), 'rb') as cf:
+                        timestamps[file_key] = _normalize_timestamp(float(pickle.load(cf)))
+                except Exception as e:
+                    _logger.warning("Could not read legacy control file %s: %s", control_file, e)
+        return timestamps
+
+    @staticmethod
+    def _file_timestamps(files: List[str]) -> Dict[str, float]:
+        """
+        Reads the creation timestamps of the given files.
+
+        The timestamp follows `fbpyutils.file.creation_date`: the creation time where the
+        platform records it, falling back to the modification time. On Windows, where a
+        directory scan returns the timestamps along with the entries, each folder is
+        scanned once; elsewhere each file is looked up with `os.stat`.
+
+        Args:
+            files (List[str]): Paths of the files.
+
+        Returns:
+            Dict[str, float]: The timestamp of each file found, keyed by its path as given.
+        """
+        def timestamp(st: os.stat_result) -> float:
+            return _normalize_timestamp(
+                st.st_ctime if os.name == 'nt' else getattr(st, 'st_birthtime', st.st_mtime))
+
+        timestamps: Dict[str, float] = {}
+        if os.name != 'nt':
+            for file in files:
+                try:
+                    timestamps[file] = timestamp(os.stat(file))
+                except OSError:
+                    pass
+            return timestamps
+
+        # Paths are matched in their absolute, case-normalized form, so that paths spelled
+        # differently (redundant separators, forward slashes on Windows, ...) are found
+        folders: Dict[str, Dict[str, List[str]]] = {}
+        for file in files:
+            path = os.path.normcase(os.path.abspath(file))
+            folders.setdefault(os.path.dirname(path), {}).setdefault(path, []).append(file)
+        for folder, folder_files in folders.items():
+            try:
+                with os.scandir(folder) as entries:
+                    for entry in entries:
+                        given = folder_files.get(os.path.normcase(os.path.join(folder, entry.name)))
+                        if given:
+                            ts = timestamp(entry.stat())
+                            for file in given:
+                                timestamps[file] = ts
+            except (FileNotFoundError, NotADirectoryError):
+                continue
+        # Files the scan could not match are looked up directly
+        for file in files:
+            if file not in timestamps:
+                try:
+                    timestamps[file] = timestamp(os.stat(file))
+                except OSError:
+                    pass
+        return timestamps
+
     def _controlled_run(self, *args: Any) -> Tuple[str, bool, Optional[str], Any]:
-        """Execute a function with file timestamp-based control.
+        """Execute a function for a file selected by timestamp-based control.
 
-        This function checks if a file needs to be processed based on its creation
-        timestamp compared to the last recorded processing timestamp. Control is maintained
-        through a pickle file that stores the timestamp of the last successful execution.
+        `run` reads the file timestamps and the last recorded processing timestamps
+        before dispatching, so only new or modified files reach this function.
 
         Args:
             *args: Variable length argument list. Expects the first argument to be the
-                   processing function and the second to be the file path, followed by
-                   any other arguments required by the processing function.
+                   current timestamp of the file (None if it was not found) and the second
+                   to be the file path, followed by any other arguments required by the
+                   processing function. The processing function is the instance's own.
 
         Returns:
             Tuple[str, bool, Optional[str], Any]: A tuple containing:
@@ -346,62 +855,25 @@ class FileProcess(Process):
                 - result (Any): Function result if successful, None otherwise.
 
         Raises:
-            ValueError: If not enough arguments are provided (at least processing function and file path).
+            ValueError: If not enough arguments are provided (at least file timestamp
+                        and file path).
             FileNotFoundError: If the file to be processed does not exist.
-
-        Note:
-            The control file is stored in a dedicated folder under the application's
-            data directory, using a hash of the function's full reference as the folder name
-            and a hash of the file path as the control file name.
         """
-        from fbpyutils.file import creation_date
-        _logger.debug(f"Starting _controlled_run with args: {args}")
+        _logger.debug("Starting _controlled_run with args: %s", args)
         try:
             if len(args) < 2:
-                _logger.error("Not enough arguments for _controlled_run. Expected at least (process_function, file_path).")
+                _logger.error("Not enough arguments for _controlled_run. Expected at least (file_timestamp, file_path).")
                 raise ValueError('Not enough arguments to run')
 
-            process: Callable = args[0] # Added type hint
+            process: Callable = self._process # Added type hint
+            current_timestamp: Optional[float] = args[0]
             process_file: str = args[1] # Added type hint
 
-            if not os.path.exists(process_file):
+            if current_timestamp is None:
                 _logger.error(f"Process file not found: {process_file}")
                 raise FileNotFoundError(f"Process file {process_file} does not exist")
 
-            # Create control folder
-            control_folder: str = os.path.sep.join([_env.USER_APP_FOLDER,
-                                             f"p_{hash_string(Process.get_function_info(process)['full_ref'])}.control"])
-            if not os.path.exists(control_folder):
-                _logger.info(f"Creating control folder: {control_folder}")
-                try:
-                    os.makedirs(control_folder)
-                except FileExistsError:
-                    _logger.warning(f"{control_folder} already exists, probably created by concurrent process. Skipping.")
-
-            # Define control file path
-            control_file: str = os.path.sep.join([control_folder, f"f_{hash_string(process_file)}.reg"])
-
-            # Get current file timestamp
-            current_timestamp: float = creation_date(process_file).timestamp()
-
-            # Check if control file exists and read last timestamp
-            control_exists: bool = os.path.exists(control_file)
-            _logger.debug(f"Control file exists for {process_file}: {control_exists}")
-            if control_exists:
-                try:
-                    with open(control_file, 'rb') as cf:
-                        last_timestamp: float = pickle.load(cf) # Added type hint
-                except Exception as e:
-                    _logger.warning(f"Could not read control file {control_file}: {e}. Treating as if control file does not exist.")
-                    last_timestamp = -1 # Treat as if no previous timestamp
-
-                # If file has not been modified since last processing, skip processing
-                if last_timestamp >= current_timestamp:
-                    _logger.debug(f"Control file timestamp: {last_timestamp}, File timestamp: {current_timestamp}. Elapsed time: {round(abs(last_timestamp - current_timestamp), 4)}")
-                    _logger.info(f"Skipping unmodified file: {process_file}.")
-                    return (process_file, True, "Skipped", None)
-
-            _logger.info(f"Processing file: {process_file}")
+            _logger.info("Processing file: %s", process_file)
             # Execute processing function
             try:
                 result = process(process_file)  # Call with file path for file processing functions
@@ -426,27 +898,13 @@ class FileProcess(Process):
                 _logger.error(f"Error processing file {process_file}: {str(e)}")
                 return (process_file, False, str(e), None)
 
-            # Update control file if processing was successful
-            if success:  # success
-                try:
-                    with open(control_file, 'wb') as cf:
-                        pickle.dump(current_timestamp, cf)
-                    _logger.info(f"Updated control file: {control_file}")
-                except Exception as e:
-                    _logger.error(f"Error writing control file {control_file}: {e}")
-            # Remove control file if it was created but an error occurred
-            elif not control_exists and os.path.exists(control_file):
-                try:
-                    os.remove(control_file)
-                    _logger.info(f"Removed control file due to error: {control_file}")
-                except Exception as e:
-                    _logger.error(f"Error removing control file {control_file}: {e}")
-
-            # For ProcessingFilesFunction, return consistent format (file_path, success, message, result)
-            _logger.debug(f"Finished _controlled_run for {process_file}. Success: {success}")
+            # The timestamp is recorded by run as the result arrives
+            _logger.debug("Finished _controlled_run for %s. Success: %s", process_file, success)
             return (process_file, success, message, proc_result)
         except Exception as e:
-            _logger.critical(f"Critical error in controlled run for {process_file}: {str(e)} at {__file__}:{inspect.currentframe().f_lineno}")
+            _logger.critical(
+                "Critical error in controlled run for %s: %s", args[1] if len(args) > 1 else None, e
+            )
             raise
 
     def __init__(self, process: Callable[..., ProcessingFilesFunction], parallelize: bool = True,
@@ -463,14 +921,8 @@ class FileProcess(Process):
                                      Defaults to Process._MAX_WORKERS (CPU count).
             sleeptime (float): Wait time in seconds between executions in serial mode. Defaults to 0.
         """
-        super().__init__(process, parallelize, workers, sleeptime) # Pass process to super().__init__
-        self._process: Callable = process # Added type hint
         _logger.debug(f"Initializing FileProcess with parallelize={parallelize}, workers={workers}, sleeptime={sleeptime}")
         super().__init__(process, parallelize, workers, sleeptime) # Pass process to super().__init__
-        self._process: Callable = process # Added type hint
-        self._parallelize: bool = parallelize and Process.is_parallelizable()
-        self._workers: int = workers or Process._MAX_WORKERS # Ensured _workers is always int
-        self.sleeptime: float = 0 if sleeptime < 0 else sleeptime
         _logger.info(f"FileProcess initialized: parallel={self._parallelize}, workers={self._workers}")
 
     def run(self, params: List[Tuple[Any, ...]], controlled: bool = False) -> List[Tuple[str, bool, Optional[str], Any]]:
@@ -498,38 +950,185 @@ class FileProcess(Process):
         try:
             if controlled:
                 _logger.info("Starting controlled execution for FileProcess.")
-                # Save the original process function
-                original_process: Callable = self._process # Added type hint
-                # Temporarily replace with _controlled_run method
-                self._process = self._controlled_run
-                try:
-                    # Execute using the modified infrastructure for execution control
-                    _params: List[Tuple[Any, ...]] = [(original_process,) + p for p in params] # Added type hint
-                    # Execute using the base class infrastructure
-                    results = super().run(_params)
-                    _logger.info("Finished controlled execution for FileProcess.")
-                    return results
-                finally:
-                    # Restore the original function
-                    self._process = original_process
+                function_ref: str = Process.get_function_info(self._process)['full_ref']
+                file_keys: List[str] = [
+                    hashlib.blake2b(p[0].encode('utf-8'), digest_size=16).hexdigest() for p in params
+                ]
+                with closing(FileProcess._open_control_db()) as db:
+                    # Read the last timestamps of the function's files in a single query
+                    last_timestamps: Dict[str, float] = {
+                        k: _normalize_timestamp(t) for k, t in db.execute(
+                            "SELECT file_hash, timestamp FROM file_control WHERE function_ref = ?", (function_ref,))}
+                    unrecorded: List[Tuple[str, str]] = [
+                        (file_key, p[0]) for file_key, p in zip(file_keys, params) if file_key not in last_timestamps
+                    ]
+                    if unrecorded:
+                        legacy_timestamps = FileProcess._legacy_timestamps(function_ref, unrecorded)
+                        if legacy_timestamps:
+                            FileProcess._record_processed(
+                                db, [(function_ref, k, t) for k, t in legacy_timestamps.items()])
+                            last_timestamps.update(legacy_timestamps)
+                            _logger.info("Migrated %d legacy control files to the control database.",
+                                         len(legacy_timestamps))
+                    timestamps: Dict[str, float] = FileProcess._file_timestamps([p[0] for p in params])
+                    # Skip the files not modified since their last processing
+                    results: List[Optional[Tuple[Any, ...]]] = [None] * len(params)
+                    pending: List[int] = []
+                    for i, (file_key, p) in enumerate(zip(file_keys, params)):
+                        # A missing timestamp compares as never processed / not found
+                        if last_timestamps.get(file_key, -1.0) >= timestamps.get(p[0], float('inf')):
+                            _logger.debug("Skipping unmodified file: %s.", p[0])
+                            results[i] = (p[0], True, "Skipped", None)
+                        else:
+                            pending.append(i)
+                    _logger.info(f"Skipped {len(params) - len(pending)} unmodified files.")
+
+                    processed: List[Tuple[str, str, float]] = []
+                    recorded = 0
+                    if pending:
+                        # Tasks are built lazily, as the executor consumes them
+                        _params: Iterable[Tuple[Any, ...]] = _SizedIterable(
+                            ((timestamps.get(params[i][0]),) + params[i] for i in pending),
+                            len(pending)) # Added type hint
+                        try:
+                            # Execute _controlled_run using the base class infrastructure, recording
+                            # the processed files in batches as their results arrive, so a failure
+                            # does not lose the files already processed
+                            for i, result in zip(pending, self._iter_with(self._controlled_run, _params)):
+                                # Serial mode reports exceptions as (False, message, None)
+                                if len(result) == 4 and result[1]:
+                                    processed.append((function_ref, file_keys[i], timestamps[params[i][0]]))
+                                    if len(processed) >= _CONTROL_DB_BATCH_SIZE:
+                                        recorded += FileProcess._record_processed(db, processed)
+                                        processed = []
+                                results[i] = result
+                        finally:
+                            recorded += FileProcess._record_processed(db, processed)
+                    _logger.info(f"Recorded {recorded} processed files in the control database.")
+                _logger.info("Finished controlled execution for FileProcess.")
+                return results
             else:
                 _logger.info("Starting normal execution for FileProcess.")
-                # If controlled=False, use the default behavior of the base class
-                results = super().run(params)
+                # If controlled=False, run the processing function as the base class does
+                results = self._run_with(self._process, params)
                 _logger.info("Finished normal execution for FileProcess.")
                 return results
         except Exception as e:
-            _logger.critical(f"Critical error in FileProcess run: {str(e)} at {__file__}:{inspect.currentframe().f_lineno}")
+            _logger.critical("Critical error in FileProcess run: %s", e, exc_info=True)
             raise
 
 
+class _SharedTaskIndex:
+    """
+    Read-only set of completed task keys shared with worker processes.
+
+    The keys are stored as sorted 64-bit prefixes of the task hashes in a single
+    shared memory block. Pickling an index only ships the block name and size, so
+    every worker process attaches to the same pages instead of receiving its own
+    copy of the whole set with each task. Membership is a binary search.
+
+    An unpickled copy attaches to the block on its first lookup and stays attached
+    only as long as the copy itself: the mapping is closed when the copy is
+    garbage collected, so workers of a reused pool do not accumulate blocks.
+    """
+
+    def __init__(self, task_keys: FrozenSet[str]) -> None:
+        """
+        Creates the shared memory block holding the given task keys.
+
+        Args:
+            task_keys (FrozenSet[str]): Non-empty set of hexadecimal task keys.
+        """
+        prefixes: List[int] = sorted({_SharedTaskIndex._prefix(k) for k in task_keys})
+        self._size: int = len(prefixes)
+        self._shm: Optional[shared_memory.SharedMemory] = shared_memory.SharedMemory(create=True, size=8 * self._size)
+        self._name: str = self._shm.name
+        with self._shm.buf.cast('Q') as keys:
+            keys[:self._size] = array.array('Q', prefixes)
+
+    @staticmethod
+    def _prefix(task_key: str) -> int:
+        return int(task_key[:16], 16)
+
+    def _block(self) -> shared_memory.SharedMemory:
+        if self._shm is None:
+            # SharedMemory closes its mapping when collected along with this copy
+            self._shm = shared_memory.SharedMemory(name=self._name)
+        return self._shm
+
+    def __contains__(self, task_key: object) -> bool:
+        key = _SharedTaskIndex._prefix(str(task_key))
+        with self._block().buf.cast('Q') as keys:
+            i = bisect.bisect_left(keys, key, 0, self._size)
+            return i < self._size and keys[i] == key
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __getstate__(self) -> Dict[str, Any]:
+        return {'_name': self._name, '_size': self._size, '_shm': None}
+
+    def release(self) -> None:
+        """Closes and removes the shared memory block. Called by its creator once the run is over."""
+        if self._shm is not None:
+            self._shm.close()
+            self._shm.unlink()
+            self._shm = None
+
+
+# Task keys are the 128-bit hexadecimal digests of the task IDs
+_TASK_KEY = re.compile(rb'[0-9a-f]{32}')
+
+# Completions written to a buffered done log before it is flushed
+_DONE_LOG_BATCH_SIZE = 64
+# Longest time, in seconds, a completion may wait in a buffered done log
+_DONE_LOG_BATCH_TIME = 0.5
+
+
+class _DoneLog:
+    """
+    Buffered append handle on a session done log, opened by a run for its own tasks.
+
+    Completions are written to the file in batches, once enough of them are pending
+    or enough time has passed, and closing the log syncs it to disk once for the
+    whole run. It is shared by the threads of the run, so appends are serialized.
+    """
+
+    def __init__(self, path: str) -> None:
+        self._file: BinaryIO = open(path, 'ab')
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._flushed_at = time.monotonic()
+
+    def append(self, task_key: str) -> None:
+        with self._lock:
+            self._file.write(f"{task_key}\n".encode('ascii'))
+            self._pending += 1
+            if (self._pending >= _DONE_LOG_BATCH_SIZE
+                    or time.monotonic() - self._flushed_at >= _DONE_LOG_BATCH_TIME):
+                self._flush()
+
+    def _flush(self) -> None:
+        self._file.flush()
+        self._pending = 0
+        self._flushed_at = time.monotonic()
+
+    def close(self) -> None:
+        with self._lock:
+            try:
+                self._flush()
+                os.fsync(self._file.fileno())
+            finally:
+                self._file.close()
+
+
 class SessionProcess(Process):
     """
     Extends Process to provide session-based control for resumable tasks.
 
     This class allows processing sessions to be interrupted and resumed without
     reprocessing completed tasks. It uses a unique session ID to track the state
-    of each task, storing its completion status in a control file. This is ideal
+    of each task, appending the completed ones to the session's done log. This is ideal
     for long-running workflows where fault tolerance and the ability to resume
     are critical.
 
@@ -574,7 +1173,7 @@ class SessionProcess(Process):
         >>> # Expected: task1 is skipped, task2 and task3 are processed successfully.
         >>>
         >>> # Clean up control files
-        >>> control_folder = os.path.join(_env.USER_APP_FOLDER, f"s_{session_id}.session")
+        >>> control_folder = SessionProcess.get_session_control_folder(session_id)
         >>> if os.path.exists(control_folder):
         ...     shutil.rmtree(control_folder)
 
@@ -582,272 +1181,113 @@ class SessionProcess(Process):
         Process: Base class providing parallel/serial processing capabilities.
     """
 
+    _DONE_LOG: str = "done.log"
+
     @staticmethod
     def generate_session_id() -> str:
         """
-        Generates a unique identifier for a new processing session.
+        Generates a unique session ID with the prefix 'session_'.
+
+        Session IDs are used to group tasks within a processing session,
+        allowing for session-level control and tracking.
 
         Returns:
-            str: A unique session ID (UUID4).
+            str: Unique session ID.
         """
-        _logger.debug("Generating new session ID.")
-        return str(uuid.uuid4())
+        return f"session_{uuid.uuid4()}"
 
     @staticmethod
     def generate_task_id(params: Tuple[Any, ...]) -> str:
         """
-        Generates a unique, deterministic ID for a task based on its parameters.
+        Generates a unique task ID based on the hash of the process parameters.
 
-        This ensures that the same task always gets the same ID, which is crucial
-        for tracking its completion status across session resumes.
+        Task IDs are used to uniquely identify each processing task within a session,
+        allowing for task-level control and tracking of execution status. The parameters
+        are hashed through their string representation with a 128-bit BLAKE2b digest,
+        so the same parameters give the same task ID across runs.
 
         Args:
-            params (Tuple[Any, ...]): The parameters for the processing task.
+            params (Tuple[Any, ...]): Tuple of process parameters. The parameters that define the task.
 
         Returns:
-            str: A hash string representing the unique task ID.
+            str: Unique task ID.
         """
-        _logger.debug(f"Generating task ID for parameters: {params}")
-        return hash_string(str(params))
-
-    def _controlled_run(self, *args: Any) -> Tuple[str, bool, Optional[str], Any]:
-        """Execute a function with session-based control.
+        params_hash: str = hashlib.blake2b(str(params).encode('utf-8'), digest_size=16).hexdigest() # Added type hint
+        return f"task_{params_hash}"
 
-        This function manages the execution of a processing function within a session,
-        allowing for resumption of tasks. It tracks the status of each task (pending,
-        completed, failed) using pickle files.
+    @staticmethod
+    def get_session_control_folder(session_id: str) -> str:
+        """
+        Builds the path of the folder holding the done log of a session.
 
         Args:
-            *args: Variable length argument list. Expects the first argument to be the
-                   processing function, the second to be the session ID, the third to be
-                   the task ID, and subsequent arguments to be the parameters for the
-                   processing function.
+            session_id (str): The session ID.
 
         Returns:
-            Tuple[str, bool, Optional[str], Any]: A tuple containing:
-                - task_id (str): The ID of the processed task.
-                - success (bool): True if processed successfully, False otherwise.
-                - error_message (Optional[str]): Error message if processing failed, None otherwise.
-                - result (Any): Function result if successful, None otherwise.
-
-        Raises:
-            ValueError: If not enough arguments are provided (at least processing function, session ID, and task ID).
-
-        Note:
-            Session and task control files are stored in a dedicated folder under the
-            application's user data directory.
+            str: Path of the session control folder under the application's user data directory.
         """
-        _logger.debug(f"Starting SessionProcess _controlled_run with args: {args}")
-        try:
-            if len(args) < 3:
-                _logger.error("Not enough arguments for SessionProcess _controlled_run. Expected at least (process_function, session_id, task_id).")
-                raise ValueError('Not enough arguments to run')
-
-            process: Callable = args[0]
-            session_id: str = args[1]
-            task_id: str = args[2]
-            process_params: Tuple[Any, ...] = args[3:]
+        return os.path.join(_env.USER_APP_FOLDER, "session_control", f"s_{hash_string(session_id)}")
 
-            # Create session control folder
-            session_control_folder: str = os.path.sep.join([_env.USER_APP_FOLDER,
-                                                     f"s_{session_id}.session"])
-            if not os.path.exists(session_control_folder):
-                _logger.info(f"Creating session control folder: {session_control_folder}")
-                try:
-                    os.makedirs(session_control_folder)
-                except FileExistsError:
-                    _logger.warning(f"{session_control_folder} already exists, probably created by concurrent process. Skipping.")
-
-            # Define task control file path
-            task_control_file: str = os.path.sep.join([session_control_folder, f"t_{task_id}.task"])
-
-            # Check if task was already processed successfully
-            if os.path.exists(task_control_file):
-                try:
-                    with open(task_control_file, 'rb') as tcf:
-                        task_status = pickle.load(tcf)
-                    if task_status.get('status') == 'completed':
-                        _logger.info(f"Skipping already completed task: {task_id} in session {session_id}.")
-                        return (task_id, True, "Skipped (completed)", task_status.get('result'))
-                except Exception as e:
-                    _logger.warning(f"Could not read task control file {task_control_file}: {e}. Re-processing task.")
-
-            _logger.info(f"Processing task: {task_id} in session {session_id}.")
-            # Execute processing function
-            try:
-                result = process(*process_params)
-                
-                # Handle various return value formats from the process function
-                if len(result) < 3:
-                    _logger.error(f"Unexpected result length from process function: {len(result)}. Result: {result}")
-                    success = False
-                    message = "Unexpected result length"
-                    proc_result = None
-                else:
-                    success = result[0]
-                    message = result[1]
-                    proc_result = result[2]
-            except Exception as e:
-                _logger.error(f"Error processing task {task_id} in session {session_id}: {str(e)}")
-                success = False
-                message = str(e)
-                proc_result = None
-
-            # Update task control file
-            task_status = {
-                'status': 'completed' if success else 'failed',
-                'timestamp': datetime.now(),
-                'message': message,
-                'result': proc_result
-            }
-            try:
-                with open(task_control_file, 'wb') as tcf:
-                    pickle.dump(task_status, tcf)
-                _logger.info(f"Updated task control file for {task_id} in session {session_id}. Status: {task_status['status']}")
-            except Exception as e:
-                _logger.error(f"Error writing task control file {task_control_file}: {e}")
-
-            _logger.debug(f"Finished SessionProcess _controlled_run for task {task_id}. Success: {success}")
-            return (task_id, success, message, proc_result)
-        except Exception as e:
-            _logger.critical(f"Critical error in SessionProcess controlled run for session {session_id}, task {task_id}: {str(e)} at {__file__}:{inspect.currentframe().f_lineno}")
-            raise
-
-    def __init__(self, process: Callable[..., ProcessingFunction], parallelize: bool = True,
-                 workers: Optional[int] = Process._MAX_WORKERS, sleeptime: float = 0) -> None:
-        """
-        Initializes a new instance of SessionProcess.
-
-        Args:
-            process (Callable): The processing function to be executed.
-                                 It must conform to the ProcessingFunction protocol.
-            parallelize (bool): If True, runs processing in parallel. If False, runs serially.
-                                 Defaults to True.
-            workers (Optional[int]): Number of workers for parallel execution.
-                                     Defaults to Process._MAX_WORKERS (CPU count).
-            sleeptime (float): Wait time in seconds between executions in serial mode. Defaults to 0.
-        """
-        _logger.debug(f"Initializing SessionProcess with parallelize={parallelize}, workers={workers}, sleeptime={sleeptime}")
-        super().__init__(process, parallelize, workers, sleeptime)
-        self._process: Callable = process
-        self._parallelize: bool = parallelize and Process.is_parallelizable()
-        self._workers: int = workers or Process._MAX_WORKERS
-        self.sleeptime: float = 0 if sleeptime < 0 else sleeptime
-        _logger.info(f"SessionProcess initialized: parallel={self._parallelize}, workers={self._workers}")
-
-    def run(self, params: List[Tuple[Any, ...]], session_id: Optional[str] = None, controlled: bool = False) -> List[Tuple[str, bool, Optional[str], Any]]:
+    @staticmethod
+    def _completed_tasks(session_control_folder: str, params: Iterable[Tuple[Any, ...]]) -> FrozenSet[str]:
         """
-        Executes processing for multiple tasks within a session, with resume capability.
+        Lists the tasks already completed in a session.
 
-        This function extends the run method of the Process class by adding session-based
-        control, allowing processing to be resumed from the point of interruption or failure.
+        The session's done log is read once, one task key per line. Earlier versions
+        recorded each completed task as a `t_<key>.reg` marker file instead, keyed by
+        `hash_string` of an MD5 based task ID. When the session control folder holds
+        such markers, each task of the run is looked up under its legacy key as well,
+        so sessions interrupted before an upgrade still resume.
 
         Args:
-            params (List[Tuple[Any, ...]]): List of parameter tuples for processing.
-                                             Each tuple contains the arguments to be passed
-                                             to the processing function.
-            session_id (Optional[str]): A unique identifier for the processing session.
-                                        If None, a new session ID will be generated.
-            controlled (bool): If True, uses session-based execution control to enable
-                               resume capability. Defaults to False.
+            session_control_folder (str): The session control folder.
+            params (Iterable[Tuple[Any, ...]]): The parameters of the tasks of the run.
 
         Returns:
-            List[Tuple[str, bool, Optional[str], Any]]: List of processing results. Each tuple contains:
-                - task_id (str): The ID of the processed task.
-                - success (bool): True if processed successfully, False otherwise.
-                - error_message (Optional[str]): Error message if processing failed, None otherwise.
-                - result (Any): Function result if successful, None otherwise.
+            FrozenSet[str]: The keys of the tasks recorded as done: the hexadecimal digest
+                            that follows "task_" in their task IDs.
         """
-        _logger.info(f"Starting SessionProcess run with {len(params)} tasks, session_id: {session_id}, controlled: {controlled}")
+        completed: set = set()
         try:
-            if controlled:
-                _session_id = session_id if session_id else SessionProcess.generate_session_id()
-                _logger.info(f"Starting session controlled execution for SessionProcess with session ID: {_session_id}.")
-                # Save the original process function
-                original_process: Callable = self._process
-                # Temporarily replace with _controlled_run method
-                self._process = self._controlled_run
-                try:
-                    _params: List[Tuple[Any, ...]] = [
-                        (original_process, _session_id, SessionProcess.generate_task_id(p)) + p
-                        for p in params
-                    ]
-                    results = super().run(_params)
-                    _logger.info(f"Finished session controlled execution for SessionProcess with session ID: {_session_id}.")
-                    return results
-                finally:
-                    # Restore the original function
-                    self._process = original_process
-            else:
-                _logger.info("Starting normal execution for SessionProcess.")
-                # If controlled=False, use the default behavior of the base class
-                # For consistency, we still generate task IDs, but they won't be persisted
-                _params_with_task_ids = [
-                    (SessionProcess.generate_task_id(p),) + p
-                    for p in params
-                ]
-                # The base Process.run expects (success, message, result) from _process.
-                # We need to adapt the lambda to return (task_id, success, message, result)
-                # when not controlled, so the return format is consistent.
-                # This requires a slight modification to how the base run is called or how _process is defined.
-                # For now, let's assume the base run handles the tuple correctly,
-                # and we'll just pass the original params.
-                # If the base run expects (success, message, result), and our _process returns (task_id, success, message, result),
-                # then the base run will get (task_id, success, message) as its (success, message, result).
-                # This needs careful consideration.
-                # Let's adjust the _process_wrapper in Process to handle this, or ensure _process returns the expected format.
-                # For now, I'll assume the base Process.run expects the direct output of self._process.
-                # If _process returns (task_id, success, message, result), and base Process.run expects (success, message, result),
-                # then we need to wrap it.
-                # Given the current structure, the base Process.run expects (bool, Optional[str], Any).
-                # Our _controlled_run returns (str, bool, Optional[str], Any).
-                # This means when controlled=False, we need to ensure the self._process returns (bool, Optional[str], Any).
-                # The original `process` passed to SessionProcess.__init__ is of type ProcessingFunction,
-                # which returns (bool, Optional[str], Any). So, for non-controlled, it's fine.
-                # The issue is the return type of SessionProcess.run itself. It should return (task_id, success, message, result).
-                # So, for non-controlled, we need to generate a task_id and combine it with the result of the original process.
-                
-                results = []
-                for p in params:
-                    task_id = SessionProcess.generate_task_id(p)
-                    success, message, proc_result = self._process(*p)
-                    results.append((task_id, success, message, proc_result))
-                
-                _logger.info("Finished normal execution for SessionProcess.")
-                return results
-        except Exception as e:
-            _logger.critical(f"Critical error in SessionProcess run: {str(e)} at {__file__}:{inspect.currentframe().f_lineno}")
-            raise
-
-    @staticmethod
-    def generate_session_id() -> str:
-        """
-        Generates a unique session ID with the prefix 'session_'.
-
-        Session IDs are used to group tasks within a processing session,
-        allowing for session-level control and tracking.
-
-        Returns:
-            str: Unique session ID.
-        """
-        return f"session_{uuid.uuid4()}"
+            with open(os.path.join(session_control_folder, SessionProcess._DONE_LOG), 'rb') as done_log:
+                for line in done_log:
+                    # Skip malformed lines, such as one truncated by an interrupted write
+                    if _TASK_KEY.fullmatch(line.strip()):
+                        completed.add(line.strip().decode('ascii'))
+        except FileNotFoundError:
+            pass
+        try:
+            with os.scandir(session_control_folder) as entries:
+                markers = {e.name[2:-4] for e in entries if e.name.startswith('t_') and e.name.endswith('.reg')}
+        except FileNotFoundError:
+            markers = set()
+        if markers:
+            for p in params:
+                task_key = SessionProcess.generate_task_id(p)[len("task_"):]
+                if task_key in markers or hash_string(f"task_{hash_string(str(p))}") in markers:
+                    completed.add(task_key)
+        return frozenset(completed)
 
     @staticmethod
-    def generate_task_id(params: Tuple[Any, ...]) -> str:
+    def _mark_done(session_control_folder: str, task_key: str, done_log: Optional[_DoneLog]) -> None:
         """
-        Generates a unique task ID based on the hash of the process parameters.
+        Appends a completed task key to the session's done log.
 
-        Task IDs are used to uniquely identify each processing task within a session,
-        allowing for task-level control and tracking of execution status.
+        Serial and thread runs write through the buffered handle opened by `run`.
+        Worker processes get no handle, since they outlive the run in a reused pool:
+        they open the log for each completion and write it unbuffered, as a line short
+        enough to be appended atomically when several of them share the log.
 
         Args:
-            params (Tuple[Any, ...]): Tuple of process parameters. The parameters that define the task.
-
-        Returns:
-            str: Unique task ID.
+            session_control_folder (str): The session control folder.
+            task_key (str): The key of the completed task.
+            done_log (Optional[_DoneLog]): The run's handle on the log, None in worker processes.
         """
-        params_hash: str = hash_string(str(params)) # Added type hint
-        return f"task_{params_hash}"
+        if done_log is not None:
+            done_log.append(task_key)
+            return
+        with open(os.path.join(session_control_folder, SessionProcess._DONE_LOG), 'ab', buffering=0) as log:
+            log.write(f"{task_key}\n".encode('ascii'))
 
     def _controlled_run(self, *args: Any) -> Tuple[str, bool, Optional[str], Any]:
         """
@@ -855,12 +1295,14 @@ class SessionProcess(Process):
 
         Checks if a task needs to be processed based on the session control mechanism.
         It determines if a task has already been successfully processed within the current session
-        by checking for the existence of a task control file.
+        by looking it up in the set of completed tasks collected when the run started.
 
         Args:
             *args: Variable length argument list. Expects the first argument to be the session ID,
-                   the second to be the processing function, and the following arguments
-                   are the parameters for the processing function.
+                   the second to be the session control folder (created by `run`), the third
+                   to be the set of completed task keys, the fourth to be the run's handle on
+                   the done log (None in worker processes), and the following arguments are the
+                   parameters for the processing function, which is the instance's own.
 
         Returns:
             Tuple[str, bool, Optional[str], Any]: A tuple containing:
@@ -870,73 +1312,58 @@ class SessionProcess(Process):
                 - result (Any): Function result if successful, None otherwise.
 
         Raises:
-            ValueError: If insufficient arguments are provided (less than session ID, process function, and parameters).
+            ValueError: If insufficient arguments are provided (less than session ID,
+                        session control folder, completed tasks and done log).
         """
         try:
-            if len(args) < 3:
+            if len(args) < 4:
                 raise ValueError('Not enough arguments to run session controlled process')
 
             session_id: str = args[0] # Added type hint
-            process: Callable = args[1] # Added type hint
-            params: Tuple[Any, ...] = args[2:] # Added type hint
+            process: Callable = self._process # Added type hint
+            session_control_folder: str = args[1]
+            completed_tasks: Container[str] = args[2]
+            done_log: Optional[_DoneLog] = args[3]
+            params: Tuple[Any, ...] = args[4:] # Added type hint
             task_id: str = SessionProcess.generate_task_id(params) # Added type hint
 
-            # Create session control folder
-            session_control_folder: str = os.path.sep.join([_env.USER_APP_FOLDER,
-                                                     "session_control",
-                                                     f"s_{hash_string(session_id)}"])
-            if not os.path.exists(session_control_folder):
-                _logger.info(f"Creating session control folder: {session_control_folder}")
-                try:
-                    os.makedirs(session_control_folder)
-                except FileExistsError:
-                    _logger.warning(f"{session_control_folder} already exists, probably created by concurrent process. Skipping.")
-
-            # Define task control file path
-            task_control_file: str = os.path.sep.join([session_control_folder, f"t_{hash_string(task_id)}.reg"])
-
-            # Check if task control file exists
-            task_control_exists: bool = os.path.exists(task_control_file)
-            _logger.info(f"Task control file exists: {task_control_exists} for task_id: {task_id}")
-            if task_control_exists:
-                _logger.info(f"Skipping already processed task: {task_id}")
+            # Check if the task is recorded as done in the session
+            task_key: str = task_id[len("task_"):]
+            if task_key in completed_tasks:
+                _logger.info("Skipping already processed task: %s", task_id)
                 return (task_id, True, "Skipped", None)
 
-            _logger.info(f"Processing task: {task_id} in session: {session_id}")
+            _logger.info("Processing task: %s in session: %s", task_id, session_id)
             # Execute processing function
             try:
                 # For session process function, we pass the actual parameters
                 result = process(*params)  # May return various formats
 
-                # Handle various return value formats from the process function
-                if len(result) < 2:
-                    _logger.error(f"Unexpected result length: {len(result)}. Result: {result}")
-                    return (task_id, False, "Unexpected result length", None)
-                
-                # Extract components from result
-                # For session process func, typically (success, message, result, data)
-                success = result[0]
-                message = result[1] if len(result) > 1 else None
-                proc_result = result[2] if len(result) > 2 else None
+                try:
+                    # Common case: a ProcessResult or any (success, message, result) tuple
+                    success, message, proc_result = result
+                except ValueError:
+                    # Handle other return value formats from the process function
+                    if len(result) < 2:
+                        _logger.error(f"Unexpected result length: {len(result)}. Result: {result}")
+                        return (task_id, False, "Unexpected result length", None)
+                    success = result[0]
+                    message = result[1]
+                    proc_result = result[2] if len(result) > 2 else None
             except Exception as e:
                 _logger.error(f"Error processing task: {str(e)}")
                 return (task_id, False, str(e), None)
 
-            # Update task control file if processing was successful
+            # Record the task as done if processing was successful
             if success:  # success
-                with open(task_control_file, 'wb') as cf:
-                    pickle.dump(True, cf) # just mark that the task was successfully executed
-                _logger.info(f"Updated task control file: {task_control_file}")
-            # Remove task control file if it was created but an error occurred
-            elif not task_control_exists and os.path.exists(task_control_file):
-                os.remove(task_control_file)
-                _logger.info(f"Removed task control file due to error: {task_control_file}")
+                SessionProcess._mark_done(session_control_folder, task_key, done_log)
+                _logger.info("Recorded task %s as done in session: %s", task_id, session_id)
 
             # For the session process, return a standardized format
             # Return structure: (task_id, success, message, result)
             return (task_id, success, message, proc_result)
         except Exception as e:
-            _logger.error(f"Error in session controlled run: {str(e)} at {__file__}:{inspect.currentframe().f_lineno}")
+            _logger.error("Error in session controlled run: %s", e)
             raise
 
     def __init__(self, process: Callable[..., ProcessingFunction], parallelize: bool = True,
@@ -956,10 +1383,6 @@ class SessionProcess(Process):
             parallel_type (str): Type of parallelization ('threads' or 'processes'). Defaults to 'threads'.
         """
         super().__init__(process, parallelize, workers, sleeptime, parallel_type)
-        self._process: Callable = process # Added type hint
-        self._parallelize: bool = parallelize and Process.is_parallelizable(parallel_type=self._parallel_type)
-        self._workers: int = workers or Process._MAX_WORKERS # Ensured _workers is always int
-        self.sleeptime: float = 0 if sleeptime < 0 else sleeptime
         _logger.info(f"SessionProcess initialized: parallel={self._parallelize}, workers={self._workers}, type={self._parallel_type}")
 
     def run(self, params: List[Tuple[Any, ...]], session_id: Optional[str] = None, controlled: bool = False) -> List[Tuple[str, bool, Optional[str], Any]]:
@@ -991,23 +1414,35 @@ class SessionProcess(Process):
                 _logger.info("Starting session controlled execution")
                 _session_id: str = session_id or SessionProcess.generate_session_id() # Added type hint
                 _logger.info(f"Session ID: {_session_id}")
-                # Save the original process function
-                original_process: Callable = self._process # Added type hint
-                # Temporarily replace with _controlled_run method
-                # Need to ensure it's bound to self to avoid method missing self issue
-                self._process = self._controlled_run
+                # Resolve the session control folder once for the whole batch
+                session_control_folder: str = SessionProcess.get_session_control_folder(_session_id)
+                os.makedirs(session_control_folder, exist_ok=True)
+                completed_tasks: Container[str] = SessionProcess._completed_tasks(session_control_folder, params)
+                _logger.info(f"Found {len(completed_tasks)} completed tasks in session {_session_id}")
+                in_processes: bool = self._parallelize and self._parallel_type == 'processes'
+                if completed_tasks and in_processes:
+                    # Worker processes share one copy of the completed tasks
+                    completed_tasks = _SharedTaskIndex(completed_tasks)
+                done_log: Optional[_DoneLog] = None
                 try:
-                    # Execute using the modified infrastructure for session control
-                    _params: List[Tuple[Any, ...]] = [(_session_id, original_process) + p for p in params] # Added type hint
-                    # Execute using the base class infrastructure
-                    return super().run(_params)
+                    if not in_processes:
+                        # Worker processes write to the done log themselves, keeping no handle open
+                        done_log = _DoneLog(os.path.join(session_control_folder, SessionProcess._DONE_LOG))
+                    # The control arguments are shared by every task: build them once
+                    # so each task tuple costs a single concatenation.
+                    control_args: Tuple[Any, ...] = (_session_id, session_control_folder, completed_tasks, done_log)
+                    _params: Iterable[Tuple[Any, ...]] = _SizedIterable((control_args + p for p in params), len(params)) # Added type hint
+                    # Execute _controlled_run using the base class infrastructure
+                    return self._run_with(self._controlled_run, _params)
                 finally:
-                    # Restore the original function
-                    self._process = original_process
+                    if done_log is not None:
+                        done_log.close()
+                    if isinstance(completed_tasks, _SharedTaskIndex):
+                        completed_tasks.release()
             else:
                 _logger.info("Starting normal execution")
-                # If controlled=False, use the default behavior of the base class
-                return super().run(params)
+                # If controlled=False, run the processing function as the base class does
+                return self._run_with(self._process, params)
         except Exception as e:
-            _logger.error(f"Error in session process execution: {str(e)} at {__file__}:{inspect.currentframe().f_lineno}")
+            _logger.error("Error in session process execution: %s", e, exc_info=True)
             raise
@@ -2,16 +2,20 @@
 Several functions to manipulate and processes strings and/or
 produce strings from any kind of data.
 '''
+import re
 import random
+import secrets
+import functools
+import itertools
 import string
 import hashlib
 import json
 
 from difflib import SequenceMatcher
 
-import uuid as u
+from uuid import uuid4
 
-from typing import Dict
+from typing import Dict, Iterable, Iterator, List, Union
 
 from fbpyutils import get_logger
 
@@ -26,27 +30,118 @@ _NORMALIZED_CHARS = ''.join([
     c + c.upper() for c in 'aaaaaeeeeiiiiooooouuuucn'
 ])
 
-_TRANSLATION_TAB = {}
-for i in range(len(_SPECIAL_CHARS)):
-    _TRANSLATION_TAB[ord(_SPECIAL_CHARS[i])] = _NORMALIZED_CHARS[i]
+_TRANSLATION_TAB = str.maketrans(_SPECIAL_CHARS, _NORMALIZED_CHARS)
 
+# normalize_names replaces spaces and slashes with underscores in the same pass
+_NAMES_SEPARATORS_TAB = str.maketrans(' /', '__')
+_NAMES_TRANSLATION_TAB = {**_TRANSLATION_TAB, **_NAMES_SEPARATORS_TAB}
 
-def uuid() -> str:
+_MULTIPLE_SPACES = re.compile(' {2,}')
+
+# Character sets of random_string, keyed by (include_digits, include_special)
+_RANDOM_ALPHABETS = {
+    (include_digits, include_special): string.ascii_letters
+    + (string.digits if include_digits else '')
+    + ('!@#$%^&*_' if include_special else '')
+    for include_digits in (False, True)
+    for include_special in (False, True)
+}
+
+# Random source of random_string when a secure string is requested
+_SECURE_RANDOM = secrets.SystemRandom()
+
+
+def uuid(compact: bool = False) -> str:
     """Generate a standard UUID4 string.
 
+    Args:
+        compact: If True, returns the 32 hexadecimal digits without dashes.
+
     Returns:
         A string with a standard UUID key.
     """
-    generated_uuid = str(u.uuid4())
-    _logger.debug(f"Generated UUID: {generated_uuid}")
-    return generated_uuid
+    generated_uuid = uuid4()
+    return generated_uuid.hex if compact else str(generated_uuid)
+
+
+@functools.lru_cache(maxsize=4096)
+def _similarity_text(x: str, ignore_case: bool, compress_spaces: bool) -> str:
+    """Prepares a string for similarity, cached for repeated (e.g. all-pairs) comparisons."""
+    if ignore_case:
+        x = x.lower()
+    if compress_spaces:
+        x = _MULTIPLE_SPACES.sub(' ', x)
+    return x
+
+
+class SimilarityScorer:
+    """Scores strings against a fixed query string.
+
+    The query is prepared and indexed once, so comparing it with many
+    candidates only prepares the candidates. Scores are the same as
+    ``similarity(candidate, query, ...)``.
+
+    Args:
+        x: The query string.
+        ignore_case: If True, ignores case during comparison.
+        compress_spaces: If True, removes extra space sequences.
+        min_ratio: Ratios below this threshold are reported as 0.0.
+
+    Example:
+        >>> scorer = SimilarityScorer("Hello World")
+        >>> [scorer.score(c) for c in ("hello  world", "help")]
+        [1.0, 0.4]
+    """
+
+    def __init__(
+        self,
+        x: str,
+        ignore_case: bool = True,
+        compress_spaces: bool = True,
+        min_ratio: float = 0.0
+    ) -> None:
+        self.ignore_case = ignore_case
+        self.compress_spaces = compress_spaces
+        self.min_ratio = min_ratio
+        self._x = _similarity_text(x, ignore_case, compress_spaces)
+        # SequenceMatcher indexes its second sequence: set it once for every candidate
+        self._matcher = SequenceMatcher(None)
+        self._matcher.set_seq2(self._x)
+
+    def score(self, y: str) -> float:
+        """Calculate the similarity ratio between a string and the query.
+
+        Args:
+            y: The string to compare with the query.
+
+        Returns:
+            The similarity ratio (0.0 to 1.0).
+        """
+        y = _similarity_text(y, self.ignore_case, self.compress_spaces)
+        x, min_ratio = self._x, self.min_ratio
+
+        # Equal strings need no matching blocks to score 1.0
+        if x == y:
+            return 1.0
+        matcher = self._matcher
+        matcher.set_seq1(y)
+        if min_ratio:
+            # Upper bound of the ratio given the lengths alone (SequenceMatcher.real_quick_ratio)
+            if 2.0 * min(len(x), len(y)) / (len(x) + len(y)) < min_ratio:
+                return 0.0
+            if matcher.quick_ratio() < min_ratio:
+                return 0.0
+            ratio = matcher.ratio()
+            return ratio if ratio >= min_ratio else 0.0
+        return matcher.ratio()
 
 
 def similarity(
     x: str,
     y: str,
     ignore_case: bool = True,
-    compress_spaces: bool = True
+    compress_spaces: bool = True,
+    min_ratio: float = 0.0
 ) -> float:
     """Calculate the similarity ratio between two strings.
 
@@ -58,37 +153,27 @@ def similarity(
         y: The second string to compare.
         ignore_case: If True, ignores case during comparison.
         compress_spaces: If True, removes extra space sequences.
+        min_ratio: Ratios below this threshold are reported as 0.0. Pairs whose
+            lengths or character counts already bound the ratio below it are
+            rejected without running the full match.
 
     Returns:
         The similarity ratio (0.0 to 1.0).
-    """
-    _logger.debug(f"Calculating similarity between '{x}' and '{y}' (ignore_case: {ignore_case}, compress_spaces: {compress_spaces})")
-    def compress(z: str) -> str:
-        original_z = z
-        while "  " in z:
-            z = z.replace("  ", " ")
-        if original_z != z:
-            _logger.debug(f"Compressed spaces: '{original_z}' -> '{z}'")
-        return z
-
-    if ignore_case:
-        x = x.lower()
-        y = y.lower()
-        _logger.debug(f"Strings after lowercasing: x='{x}', y='{y}'")
 
-    if compress_spaces:
-        x = compress(x)
-        y = compress(y)
-
-    ratio = SequenceMatcher(None, x, y).ratio()
-    _logger.debug(f"Similarity ratio: {ratio}")
-    return ratio
+    Note:
+        The lowercased and space-compressed forms of recently seen strings are
+        cached, so comparing each of N strings with M others prepares N + M
+        strings instead of N * M pairs. To compare one string with many others,
+        use a SimilarityScorer, which also indexes that string only once.
+    """
+    return SimilarityScorer(y, ignore_case, compress_spaces, min_ratio).score(x)
 
 
 def random_string(
     x: int = 32,
     include_digits: bool = True,
-    include_special: bool = False
+    include_special: bool = False,
+    secure: bool = False
 ) -> str:
     """Generate a random string.
 
@@ -99,28 +184,22 @@ def random_string(
         x: The length of the random string.
         include_digits: If True, includes digits (0-9).
         include_special: If True, includes special characters (!@#$%^&*_).
+        secure: If True, draws from the operating system's secure random
+            source, suitable for passwords and tokens.
 
     Returns:
         A random string with the specified properties.
     """
-    _logger.debug(f"Generating random string of length {x} (include_digits: {include_digits}, include_special: {include_special})")
-    letters = string.ascii_letters + \
-        (string.digits if include_digits else '') + \
-        ('!@#$%^&*_' if include_special else '')
-    
-    if not letters:
-        _logger.warning("No character set selected for random string generation. Returning empty string.")
-        return ""
-
-    generated_string = ''.join(random.choice(letters) for i in range(x))
-    _logger.debug(f"Generated random string (first 5 chars): {generated_string[:5]}...")
+    choices = _SECURE_RANDOM.choices if secure else random.choices
+    generated_string = ''.join(choices(_RANDOM_ALPHABETS[(bool(include_digits), bool(include_special))], k=x))
     return generated_string
 
 
 def json_string(x: Dict) -> str:
     """Convert a dictionary to a JSON string.
 
-    The output string is encoded as UTF-8.
+    Non-ASCII characters are kept as is and values that JSON cannot represent
+    are converted with str().
 
     Args:
         x: The dictionary to convert.
@@ -129,54 +208,85 @@ def json_string(x: Dict) -> str:
         A JSON string representation of the dictionary.
     """
     _logger.debug("Converting dictionary to JSON string.")
-    _default = lambda obj: obj.__str__() # Use obj instead of x to avoid shadowing
     try:
-        s = json.dumps(
-            x, default=_default,
-            ensure_ascii=False).encode('utf8')
-        decoded_string = s.decode()
+        s = json.dumps(x, default=str, ensure_ascii=False)
         _logger.debug("Successfully converted dictionary to JSON string.")
-        return decoded_string
+        return s
     except TypeError as e:
-        _logger.error(f"TypeError during JSON string conversion: {e}. Input: {x}")
+        _logger.error("TypeError during JSON string conversion: %s. Input: %s", e, x)
         raise
     except Exception as e:
-        _logger.error(f"An unexpected error occurred during JSON string conversion: {e}. Input: {x}")
+        _logger.error("An unexpected error occurred during JSON string conversion: %s. Input: %s", e, x)
         raise
 
 
-def hash_string(x: str) -> str:
-    """Generate an MD5 hash from a string.
+def hash_string(x: Union[str, bytes], algorithm: str = 'md5') -> str:
+    """Generate a hash from a string.
 
-    The input string is encoded as UTF-8 before hashing.
+    The input string is encoded as UTF-8 before hashing; bytes are hashed as
+    they are. MD5 is used as a fingerprint, not for security. It is the default,
+    as hashes produced by previous versions may be stored by callers. For new
+    cache or deduplication keys, 'blake2b' is faster and gives a digest of the
+    same length.
 
     Args:
-        x: The string to hash.
+        x: The string or bytes to hash.
+        algorithm: 'md5', 'blake2b' (16-byte digest) or any other algorithm
+            name accepted by hashlib.new.
 
     Returns:
-        A hexadecimal MD5 hash string.
+        A hexadecimal hash string.
     """
-    _logger.debug(f"Hashing string (first 10 chars): '{x[:10]}...'")
-    hashed_string = hashlib.md5(x.encode('utf-8')).hexdigest()
-    _logger.debug(f"Generated hash: {hashed_string}")
-    return hashed_string
+    return _hash_bytes(x if isinstance(x, bytes) else x.encode('utf-8'), algorithm)
 
 
-def hash_json(x: Dict) -> str:
-    """Generate an MD5 hash from a dictionary.
+def hash_strings(xs: Iterable[Union[str, bytes]], algorithm: str = 'md5') -> List[str]:
+    """Generate the hashes of many strings.
 
-    The dictionary is first converted to a JSON string, then hashed.
+    Gives the same results as calling hash_string on each string, with the
+    hash constructor resolved once for the whole batch.
+
+    Args:
+        xs: The strings (or bytes) to hash.
+        algorithm: The hash algorithm, as in hash_string.
+
+    Returns:
+        A list with the hexadecimal hash of each string, in order.
+    """
+    if algorithm == 'md5':
+        new = functools.partial(hashlib.md5, usedforsecurity=False)
+    elif algorithm == 'blake2b':
+        new = functools.partial(hashlib.blake2b, digest_size=16)
+    else:
+        new = functools.partial(hashlib.new, algorithm)
+    return [new(x if isinstance(x, bytes) else x.encode('utf-8')).hexdigest() for x in xs]
+
+
+def _hash_bytes(data: bytes, algorithm: str) -> str:
+    if algorithm == 'md5':
+        return hashlib.md5(data, usedforsecurity=False).hexdigest()
+    if algorithm == 'blake2b':
+        return hashlib.blake2b(data, digest_size=16).hexdigest()
+    return hashlib.new(algorithm, data).hexdigest()
+
+
+def hash_json(x: Dict, algorithm: str = 'md5', sort_keys: bool = False) -> str:
+    """Generate a hash from a dictionary.
+
+    The dictionary is first converted to JSON, as in json_string, then hashed.
 
     Args:
         x: The dictionary to hash.
+        algorithm: The hash algorithm, as in hash_string.
+        sort_keys: If True, sorts the keys so that equal dictionaries hash the
+            same regardless of insertion order. Off by default to keep the
+            hashes of previous versions.
 
     Returns:
-        A hexadecimal MD5 hash string.
+        A hexadecimal hash string.
     """
-    _logger.debug("Hashing JSON dictionary.")
-    hashed_json = hash_string(json_string(x))
-    _logger.debug(f"Generated JSON hash: {hashed_json}")
-    return hashed_json
+    data = json.dumps(x, default=str, ensure_ascii=False, sort_keys=sort_keys).encode('utf-8')
+    return _hash_bytes(data, algorithm)
 
 
 def normalize_value(
@@ -197,26 +307,37 @@ def normalize_value(
 
     Example:
         >>> normalize_value(1.2, size=5, decimal_places=2)
-        '00120'
+        '0120'
         >>> normalize_value(1.21, size=5, decimal_places=2)
-        '00121'
+        '0121'
         >>> normalize_value(12.3)
         '1230'
     """
-    _logger.debug(f"Normalizing value {x} to string (size: {size}, decimal_places: {decimal_places})")
     try:
-        format_string = "{:0" + str(size) + "." + str(decimal_places) + "f}"
-        normalized_string = format_string.format(abs(x)).replace('.', '')
-        _logger.debug(f"Normalized string: {normalized_string}")
+        # Formatting rounds the exact binary value once; scaling by 10 ** decimal_places
+        # first would round twice (1.115 * 100 == 111.5 exactly, giving 112 instead of 111)
+        normalized_string = f"{abs(x):0{size}.{decimal_places}f}".replace('.', '')
         return normalized_string
     except ValueError as e:
-        _logger.error(f"ValueError during value normalization: {e}. Input: {x}, size: {size}, decimal_places: {decimal_places}")
+        _logger.error("ValueError during value normalization: %s. Input: %s, size: %s, decimal_places: %s", e, x, size, decimal_places)
         raise
     except Exception as e:
-        _logger.error(f"An unexpected error occurred during value normalization: {e}. Input: {x}")
+        _logger.error("An unexpected error occurred during value normalization: %s. Input: %s", e, x)
         raise
 
 
+@functools.lru_cache(maxsize=8192)
+def _translated(x: str) -> str:
+    """Translates special characters, cached since the same names recur across calls."""
+    return x.translate(_TRANSLATION_TAB)
+
+
+@functools.lru_cache(maxsize=8192)
+def _normalized_name(name: str, normalize_specials: bool) -> str:
+    """Normalizes a single name, cached since column names recur across calls."""
+    return name.translate(_NAMES_TRANSLATION_TAB if normalize_specials else _NAMES_SEPARATORS_TAB).lower()
+
+
 def translate_special_chars(x: str) -> str:
     """Translate special (accented) characters to their basic counterparts.
 
@@ -226,14 +347,12 @@ def translate_special_chars(x: str) -> str:
     Returns:
         A new string with special characters replaced.
     """
-    _logger.debug(f"Translating special characters for string: '{x}'")
-    x = x or ''
-    translated_string = x.translate(_TRANSLATION_TAB)
-    _logger.debug(f"Translated string: '{translated_string}'")
-    return translated_string
-
-
-from typing import List
+    if not x:
+        return ''
+    # Plain ASCII has no special characters to translate
+    if x.isascii():
+        return x
+    return _translated(x)
 
 
 def normalize_names(names: List[str], normalize_specials: bool = True) -> List[str]:
@@ -249,11 +368,12 @@ def normalize_names(names: List[str], normalize_specials: bool = True) -> List[s
     Returns:
         A list of normalized strings.
     """
-    _logger.debug(f"Normalizing names (normalize_specials: {normalize_specials}). Input names: {names}")
-    normalized_list = [
-        str(translate_special_chars(c) if normalize_specials else c).replace(' ', '_').replace('/', '_').lower() for c in names
-    ]
-    _logger.debug(f"Normalized names: {normalized_list}")
+    _logger.debug("Normalizing names (normalize_specials: %s). Input names: %s", normalize_specials, names)
+    if normalize_specials:
+        normalized_list = [_normalized_name(c or '', True) for c in names]
+    else:
+        normalized_list = [_normalized_name(str(c), False) for c in names]
+    _logger.debug("Normalized names: %s", normalized_list)
     return normalized_list
 
 
@@ -272,17 +392,41 @@ def split_by_lengths(string: str, lengths: List[int]) -> List[str]:
         >>> split_by_lengths("HelloWorld", [5, 5])
         ['Hello', 'World']
     """
-    _logger.debug(f"Splitting string by lengths. Input string length: {len(string)}, lengths: {lengths}")
-    substrings = []
-    start_index = 0
-    for i, length in enumerate(lengths):
-        end_index = start_index + length
-        substring = string[start_index:end_index]
-        if substring:  # Adiciona apenas se não for vazio
-            substrings.append(substring)
-            _logger.debug(f"Added substring {i+1}: '{substring}'")
-        else:
-            _logger.warning(f"Substring {i+1} is empty for length {length} at index {start_index}. Skipping.")
-        start_index = end_index
-    _logger.debug(f"Finished splitting string. Total substrings: {len(substrings)}")
+    _logger.debug("Splitting string by lengths. Input string length: %d, lengths: %s", len(string), lengths)
+    ends = list(itertools.accumulate(lengths))
+    starts = [0] + ends[:-1]
+    pieces = [string[start:end] for start, end in zip(starts, ends)]
+    substrings = [piece for piece in pieces if piece]  # Adiciona apenas se não for vazio
+    if len(substrings) < len(pieces):
+        for i, piece in enumerate(pieces):
+            if not piece:
+                _logger.warning("Substring %d is empty for length %d at index %d. Skipping.", i + 1, ends[i] - starts[i], starts[i])
+    _logger.debug("Finished splitting string. Total substrings: %d", len(substrings))
     return substrings
+
+
+def isplit_by_lengths(string: str, lengths: Iterable[int]) -> Iterator[str]:
+    """Split a string into substrings of specified lengths, lazily.
+
+    Yields the same substrings as split_by_lengths, one at a time, for
+    callers that consume them in order.
+
+    Args:
+        string: The input string to split.
+        lengths: The lengths of the substrings.
+
+    Yields:
+        The non-empty substrings, in order.
+
+    Example:
+        >>> list(isplit_by_lengths("HelloWorld", [5, 5]))
+        ['Hello', 'World']
+    """
+    start = 0
+    for i, end in enumerate(itertools.accumulate(lengths)):
+        piece = string[start:end]
+        if piece:
+            yield piece
+        else:
+            _logger.warning("Substring %d is empty for length %d at index %d. Skipping.", i + 1, end - start, start)
+        start = end
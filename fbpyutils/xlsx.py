@@ -3,20 +3,28 @@ Functions to read and write MS Excel Spreadsheet files in xls or xlsx formats.
 '''
 import os
 import io
+import stat
+import itertools
+import threading
 import openpyxl
 import xlrd
-from openpyxl import load_workbook
 from datetime import datetime
 import pandas as pd
-from typing import Union, Dict
+from collections import OrderedDict
+from typing import BinaryIO, NamedTuple, Union, Dict, Iterator, Optional, Tuple
 import warnings
+import weakref
 from fbpyutils import get_logger
+from fbpyutils.process import Process
 
 
 _logger = get_logger()
 
 XLS, XLSX = 0, 1
 
+# First bytes of OLE2 compound documents, the container of legacy xls files
+_XLS_SIGNATURE = b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1'
+
 
 class ExcelWorkbook:
     """
@@ -32,75 +40,143 @@ class ExcelWorkbook:
         kind (int): The detected file format (XLS or XLSX).
     """
 
-    def __init__(self, xl_file: Union[str, bytes]):
+    def __init__(self, xl_file: Union[str, os.PathLike, bytes, bytearray, memoryview]):
         """
         Initializes an ExcelWorkbook object from a file path or bytes.
 
         Args:
-            xl_file: Path to the Excel file (str) or the file content as bytes.
+            xl_file: Path to the Excel file (str or path-like) or the file content
+                as a bytes-like object.
 
         Raises:
             FileNotFoundError: If the provided file path does not exist.
-            TypeError: If xl_file is not a string path or bytes.
+            TypeError: If xl_file is not a path or bytes.
             ValueError: If the file cannot be opened as a valid Excel workbook.
 
+        Note:
+            A workbook opened from a path holds the file open, as its sheets are
+            read from it on demand, until `close()` is called or the workbook is
+            garbage collected. On Windows the file cannot be deleted or replaced
+            meanwhile. Call `close()` when done, or use the workbook as a context
+            manager. Workbooks opened from bytes hold no file.
+
         Example:
             >>> # From a file path
-            >>> workbook = ExcelWorkbook('path/to/your/file.xlsx')
-            
+            >>> with ExcelWorkbook('path/to/your/file.xlsx') as workbook:
+            ...     data = workbook.read_sheet()
+
             >>> # From bytes
             >>> with open('path/to/your/file.xls', 'rb') as f:
             ...     file_bytes = f.read()
             >>> workbook = ExcelWorkbook(file_bytes)
         """
-        _logger.debug(f"Initializing ExcelWorkbook with file: {xl_file}")
-        data = None
+        _logger.debug("Initializing ExcelWorkbook with file: %s", xl_file)
+        self.workbook = None
+        self.sheet_names = None
+        self.kind = XLSX
+        self._file = None
+        self._file_finalizer = None
 
-        if isinstance(xl_file, str):
-            if os.path.exists(xl_file):
+        if isinstance(xl_file, (str, os.PathLike)):
+            xl_file = os.fspath(xl_file)
+            if os.path.isfile(xl_file):
                 try:
-                    with open(xl_file, 'rb') as f:
-                        data = f.read()
-                    _logger.info(f"Successfully read Excel file from path: {xl_file}")
+                    # The file is kept open and read on demand: it is closed by close()
+                    self._file = open(xl_file, 'rb')
+                    self._file_finalizer = weakref.finalize(self, self._file.close)
+                    _logger.info("Successfully opened Excel file from path: %s", xl_file)
                 except (OSError, IOError) as e:
-                    _logger.error(f"Error reading the Excel file {xl_file}: {e}")
+                    _logger.error("Error reading the Excel file %s: %s", xl_file, e)
                     raise
             else:
-                _logger.error(f"Excel file not found: {xl_file}")
+                _logger.error("Excel file not found: %s", xl_file)
                 raise FileNotFoundError(f'File {xl_file} does not exist.')
-        elif isinstance(xl_file, bytes):
-            data = xl_file
+            xl_data = self._file
+        elif isinstance(xl_file, (bytes, bytearray, memoryview)):
+            xl_data = io.BytesIO(xl_file)
             _logger.info("Received Excel file as bytes.")
         else:
-            _logger.error(f"Invalid file reference type: {type(xl_file)}. Must be a file path (str) or bytes.")
+            _logger.error("Invalid file reference type: %s. Must be a file path (str) or bytes.", type(xl_file))
             raise TypeError('Invalid file reference. Must be a file path or array of bytes.')
 
-        self.workbook = None
-        self.sheet_names = None
-        self.kind = XLSX
+        # Legacy xls files are OLE2 documents, which openpyxl cannot open
+        is_xls = xl_data.read(len(_XLS_SIGNATURE)) == _XLS_SIGNATURE
+        xl_data.seek(0)
 
-        try:
-            xl_data = io.BytesIO(data)
+        # Scoped, so the caller's warning filters are restored afterwards
+        with warnings.catch_warnings():
             warnings.simplefilter("ignore")
-            self.workbook = openpyxl.open(xl_data, data_only=True)
-            self.sheet_names = self.workbook.sheetnames
-            _logger.debug("Workbook opened successfully with openpyxl (XLSX format).")
-        except Exception as e_xlsx:
-            _logger.warning(f"Failed to open with openpyxl, trying xlrd. Error: {e_xlsx}")
-            try:
-                xl_data.seek(0)
-                self.workbook = xlrd.open_workbook(file_contents=xl_data.read())
-                self.sheet_names = self.workbook.sheet_names()
-                self.kind = XLS
-                _logger.debug("Workbook opened successfully with xlrd (XLS format).")
-            except Exception as e_xls:
-                _logger.error(f"Failed to open workbook with both openpyxl and xlrd. XLSX error: {e_xlsx}, XLS error: {e_xls}")
-                raise ValueError("Could not open workbook. Invalid file format or corrupted file.") from e_xls
-        finally:
-            warnings.simplefilter("default")
+            if is_xls:
+                try:
+                    self._open_xls(xl_file, xl_data)
+                except Exception as e_xls:
+                    _logger.error("Failed to open workbook with xlrd. XLS error: %s", e_xls)
+                    raise ValueError("Could not open workbook. Invalid file format or corrupted file.") from e_xls
+            else:
+                try:
+                    # Read-only workbooks parse sheets lazily, as they are read. Links to
+                    # external workbooks are not needed to read cached values
+                    self.workbook = openpyxl.open(xl_data, read_only=True, data_only=True, keep_links=False)
+                    self.sheet_names = self.workbook.sheetnames
+                    _logger.debug("Workbook opened successfully with openpyxl (XLSX format).")
+                except Exception as e_xlsx:
+                    _logger.warning("Failed to open with openpyxl, trying xlrd. Error: %s", e_xlsx)
+                    try:
+                        self._open_xls(xl_file, xl_data)
+                    except Exception as e_xls:
+                        _logger.error("Failed to open workbook with both openpyxl and xlrd. XLSX error: %s, XLS error: %s", e_xlsx, e_xls)
+                        raise ValueError("Could not open workbook. Invalid file format or corrupted file.") from e_xls
         _logger.info("ExcelWorkbook initialized.")
 
-    def read_sheet(self, sheet_name: str = None) -> tuple[tuple[Union[str, float, int, bool, datetime, None], ...], ...]:
+    def _open_xls(self, xl_file: Union[str, bytes], xl_data: BinaryIO) -> None:
+        """Opens the workbook with xlrd, loading sheets on demand, and releases the file."""
+        try:
+            if self._file is not None:
+                # xlrd maps the file itself, instead of taking a copy of its contents
+                self._close_file()
+                self.workbook = xlrd.open_workbook(filename=xl_file, on_demand=True)
+            else:
+                self.workbook = xlrd.open_workbook(
+                    file_contents=xl_data.getvalue(), on_demand=True
+                )
+            self.sheet_names = self.workbook.sheet_names()
+            self.kind = XLS
+            _logger.debug("Workbook opened successfully with xlrd (XLS format).")
+        finally:
+            self._close_file()
+
+    def __enter__(self) -> 'ExcelWorkbook':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _close_file(self) -> None:
+        if self._file_finalizer is not None:
+            self._file_finalizer()
+            self._file = self._file_finalizer = None
+
+    def close(self) -> None:
+        """
+        Closes the workbook and the file it was read from.
+
+        Workbooks opened from a path keep the file open while their sheets are
+        read, until they are closed or garbage collected. Close them when done,
+        or use the workbook as a context manager.
+
+        Example:
+            >>> with ExcelWorkbook('tests/test_xlsx_file.xlsx') as workbook:
+            ...     data = workbook.read_sheet()
+        """
+        if self.kind == XLSX and self.workbook is not None:
+            self.workbook.close()
+        elif self.kind == XLS and self.workbook is not None:
+            self.workbook.release_resources()
+        self._close_file()
+
+    def read_sheet(
+        self, sheet_name: str = None, nrows: Optional[int] = None, skiprows: int = 0
+    ) -> tuple[tuple[Union[str, float, int, bool, datetime, None], ...], ...]:
         """
         Reads the contents of a sheet by its name.
 
@@ -108,6 +184,9 @@ class ExcelWorkbook:
 
         Args:
             sheet_name: The name of the sheet to read. Defaults to the first sheet.
+            nrows: The maximum number of rows to read. Defaults to all rows. The
+                rest of the sheet is not parsed, which makes previews cheap.
+            skiprows: The number of rows to skip at the start of the sheet.
 
         Returns:
             A tuple of tuples, where each inner tuple represents a row of cells.
@@ -121,27 +200,83 @@ class ExcelWorkbook:
             >>> data = workbook.read_sheet()
             >>> # Read a specific sheet by name
             >>> data_sheet2 = workbook.read_sheet('Sheet2')
+            >>> # Read the first 10 rows after the header
+            >>> preview = workbook.read_sheet(nrows=10, skiprows=1)
         """
         sheet_name = sheet_name or self.sheet_names[0]
-        _logger.debug(f"Reading sheet: {sheet_name}")
+        _logger.debug("Reading sheet: %s", sheet_name)
 
         if sheet_name not in self.sheet_names:
-            _logger.error(f"Invalid or nonexistent sheet name: {sheet_name}. Available sheets: {self.sheet_names}")
+            _logger.error("Invalid or nonexistent sheet name: %s. Available sheets: %s", sheet_name, self.sheet_names)
             raise NameError('Invalid/Nonexistent sheet.')
 
         try:
             if self.kind == XLSX:
-                sh = self.workbook[sheet_name]
-                rows = tuple(tuple(c.value for c in r) for r in sh.iter_rows())
+                rows = list(self._iter_rows(sheet_name, nrows, skiprows))
+                while rows and not rows[-1]:
+                    rows.pop()
+                width = max(map(len, rows), default=0)
+                rows = tuple(r + (None,) * (width - len(r)) for r in rows)
             else:  # XLS
-                sh = self.workbook.sheet_by_name(sheet_name)
-                rows = tuple(tuple(sh.cell_value(r, c) for c in range(sh.ncols)) for r in range(sh.nrows))
-            _logger.info(f"Successfully read sheet '{sheet_name}'. Rows read: {len(rows)}")
+                rows = tuple(self._iter_rows(sheet_name, nrows, skiprows))
+            _logger.info("Successfully read sheet '%s'. Rows read: %s", sheet_name, len(rows))
             return rows
         except Exception as e:
-            _logger.error(f"Error reading sheet '{sheet_name}': {e}")
+            _logger.error("Error reading sheet '%s': %s", sheet_name, e)
             raise
 
+    def _iter_rows(
+        self, sheet_name: str, nrows: Optional[int] = None, skiprows: int = 0
+    ) -> Iterator[tuple[Union[str, float, int, bool, datetime, None], ...]]:
+        """Yields the rows of a sheet as stored, each one as a tuple of values."""
+        stop = None if nrows is None else skiprows + nrows
+        if self.kind == XLSX:
+            sh = self.workbook[sheet_name]
+            # The dimensions declared in the file may be wrong, so rows are read as
+            # stored and sized from their cells, as a regular workbook would
+            sh.reset_dimensions()
+            # Rows are parsed as they are consumed: stopping early skips the rest
+            return map(tuple, itertools.islice(sh.iter_rows(values_only=True), skiprows, stop))
+        sh = self.workbook.sheet_by_name(sheet_name)
+        stop = sh.nrows if stop is None else min(stop, sh.nrows)
+        return (tuple(sh.row_values(r)) for r in range(skiprows, stop))
+
+    def iter_sheet(
+        self, sheet_name: str = None, chunksize: int = 10_000
+    ) -> Iterator[tuple[tuple[Union[str, float, int, bool, datetime, None], ...], ...]]:
+        """
+        Reads the contents of a sheet by its name, in chunks of rows.
+
+        Unlike read_sheet, the sheet is never held in memory as a whole, which
+        suits large sheets processed piece by piece. Since the sheet width is
+        only known at the end, xlsx rows are yielded as stored: each one ends at
+        its last stored cell, and trailing empty rows are kept.
+
+        Args:
+            sheet_name: The name of the sheet to read. Defaults to the first sheet.
+            chunksize: The maximum number of rows in each chunk.
+
+        Returns:
+            An iterator of tuples of rows, each row being a tuple of cells.
+
+        Raises:
+            NameError: If the specified sheet name does not exist.
+
+        Example:
+            >>> with ExcelWorkbook('tests/test_xlsx_file.xlsx') as workbook:
+            ...     for rows in workbook.iter_sheet(chunksize=1000):
+            ...         df = pd.DataFrame(rows)
+        """
+        sheet_name = sheet_name or self.sheet_names[0]
+        _logger.debug("Reading sheet in chunks: %s", sheet_name)
+
+        if sheet_name not in self.sheet_names:
+            _logger.error("Invalid or nonexistent sheet name: %s. Available sheets: %s", sheet_name, self.sheet_names)
+            raise NameError('Invalid/Nonexistent sheet.')
+
+        rows = self._iter_rows(sheet_name)
+        return iter(lambda: tuple(itertools.islice(rows, chunksize)), ())
+
     def read_sheet_by_index(self, index: int = 0) -> tuple[tuple[Union[str, float, int, bool, datetime, None], ...], ...]:
         """
         Reads the contents of a sheet by its zero-based index.
@@ -162,15 +297,109 @@ class ExcelWorkbook:
             >>> # Read the second sheet (index 1)
             >>> data_sheet2 = workbook.read_sheet_by_index(1)
         """
-        _logger.debug(f"Reading sheet by index: {index}")
+        _logger.debug("Reading sheet by index: %s", index)
 
         if not 0 <= index < len(self.sheet_names):
-            _logger.error(f"Invalid or nonexistent sheet index: {index}. Total sheets: {len(self.sheet_names)}")
+            _logger.error("Invalid or nonexistent sheet index: %s. Total sheets: %s", index, len(self.sheet_names))
             raise IndexError('Sheet index out of range.')
 
         return self.read_sheet(self.sheet_names[index])
 
 
+class _CachedWorkbook(NamedTuple):
+    """Contents and sheet names of a workbook file, as cached by the module functions."""
+    data: bytes
+    sheet_names: Tuple[str, ...]
+
+
+# Workbook files read by path through the module functions, keyed by (path, mtime_ns, size).
+# Only their contents are kept: every call opens its own workbook from them, so no file
+# stays open and no workbook is shared between callers
+_WORKBOOK_CACHE_SIZE = 8
+# Larger files are not cached, as their contents would take too much memory
+_WORKBOOK_CACHE_MAX_FILE_SIZE = 16 * 1024 * 1024
+_workbook_cache: 'OrderedDict[Tuple[str, int, int], _CachedWorkbook]' = OrderedDict()
+_workbook_cache_lock = threading.Lock()
+
+
+def _workbook_cache_key(path: str, st: os.stat_result) -> Optional[Tuple[str, int, int]]:
+    """Returns the cache key of a workbook file, or None if the file is not cached."""
+    if not stat.S_ISREG(st.st_mode) or st.st_size > _WORKBOOK_CACHE_MAX_FILE_SIZE:
+        return None
+    return (path, st.st_mtime_ns, st.st_size)
+
+
+def _cached_workbook(xl_file: Union[str, os.PathLike, bytes]) -> Optional[_CachedWorkbook]:
+    """Returns the cached contents of a workbook given by path, or None if not cached."""
+    if not isinstance(xl_file, (str, os.PathLike)):
+        return None
+    path = os.path.abspath(os.fspath(xl_file))
+    try:
+        key = _workbook_cache_key(path, os.stat(path))
+    except OSError:
+        return None
+    with _workbook_cache_lock:
+        cached = _workbook_cache.get(key)
+        if cached is not None:
+            _workbook_cache.move_to_end(key)
+        return cached
+
+
+def _open_workbook(xl_file: Union[str, os.PathLike, bytes]) -> ExcelWorkbook:
+    """
+    Opens a workbook for the module functions, to be closed by the caller.
+
+    The contents of workbooks given by the path of an existing file, up to
+    `_WORKBOOK_CACHE_MAX_FILE_SIZE`, are cached while the file keeps its modification
+    time and size, so repeated queries on the same file read it once. The workbook is
+    opened from the cached contents and holds no file.
+    """
+    cached = _cached_workbook(xl_file)
+    if cached is not None:
+        return ExcelWorkbook(cached.data)
+    if not isinstance(xl_file, (str, os.PathLike)):
+        return ExcelWorkbook(xl_file)
+    path = os.path.abspath(os.fspath(xl_file))
+    try:
+        with open(path, 'rb') as f:
+            # The key comes from the open file, so it matches the contents read
+            key = _workbook_cache_key(path, os.fstat(f.fileno()))
+            data = f.read() if key is not None else None
+    except OSError:
+        key = None
+    if key is None:
+        return ExcelWorkbook(xl_file)
+    xl = ExcelWorkbook(data)
+    with _workbook_cache_lock:
+        # Older versions of the file are stale
+        for stale_key in [k for k in _workbook_cache if k[0] == path]:
+            del _workbook_cache[stale_key]
+        _workbook_cache[key] = _CachedWorkbook(data, tuple(xl.sheet_names))
+        while len(_workbook_cache) > _WORKBOOK_CACHE_SIZE:
+            _workbook_cache.popitem(last=False)
+    return xl
+
+
+def clear_workbook_cache(workbook_path: Optional[Union[str, os.PathLike]] = None) -> None:
+    """
+    Drops workbook contents cached by the module functions, releasing their memory.
+
+    Args:
+        workbook_path: The path of the workbook to drop. Defaults to all workbooks.
+
+    Example:
+        >>> names = get_sheet_names('tests/test_xlsx_file.xlsx')
+        >>> clear_workbook_cache('tests/test_xlsx_file.xlsx')
+    """
+    with _workbook_cache_lock:
+        if workbook_path is None:
+            _workbook_cache.clear()
+        else:
+            path = os.path.abspath(os.fspath(workbook_path))
+            for key in [k for k in _workbook_cache if k[0] == path]:
+                del _workbook_cache[key]
+
+
 def get_sheet_names(xl_file: Union[str, bytes]) -> list[str]:
     """
     Retrieves the names of all sheets from an Excel file.
@@ -188,18 +417,23 @@ def get_sheet_names(xl_file: Union[str, bytes]) -> list[str]:
         >>> print(names)
         ['Sheet1', 'Sheet2']
     """
-    _logger.debug(f"Getting sheet names for file: {xl_file}")
+    _logger.debug("Getting sheet names for file: %s", xl_file)
     try:
-        xl = ExcelWorkbook(xl_file)
-        _logger.info(f"Retrieved sheet names: {xl.sheet_names}")
-        return xl.sheet_names
+        cached = _cached_workbook(xl_file)
+        if cached is not None:
+            sheet_names = list(cached.sheet_names)
+        else:
+            with _open_workbook(xl_file) as xl:
+                sheet_names = xl.sheet_names
+        _logger.info("Retrieved sheet names: %s", sheet_names)
+        return sheet_names
     except Exception as e:
-        _logger.error(f"Error getting sheet names from {xl_file}: {e}")
+        _logger.error("Error getting sheet names from %s: %s", xl_file, e)
         raise
 
 
 def get_sheet_by_name(
-    xl_file: Union[str, bytes], sheet_name: str
+    xl_file: Union[str, bytes], sheet_name: str, nrows: Optional[int] = None, skiprows: int = 0
 ) -> tuple[tuple[Union[str, float, int, bool, datetime, None], ...], ...]:
     """
     Reads a specific sheet from an Excel file by its name.
@@ -209,6 +443,8 @@ def get_sheet_by_name(
     Args:
         xl_file: Path to the Excel file or the file content as bytes.
         sheet_name: The name of the sheet to read.
+        nrows: The maximum number of rows to read, as in `ExcelWorkbook.read_sheet`.
+        skiprows: The number of rows to skip at the start of the sheet.
 
     Returns:
         The sheet content as a tuple of tuples.
@@ -216,19 +452,70 @@ def get_sheet_by_name(
     Example:
         >>> data = get_sheet_by_name('tests/test_xlsx_file.xlsx', 'Sheet1')
     """
-    _logger.debug(f"Getting sheet by name '{sheet_name}' from file: {xl_file}")
+    _logger.debug("Getting sheet by name '%s' from file: %s", sheet_name, xl_file)
     try:
-        xl = ExcelWorkbook(xl_file)
-        sheet_content = xl.read_sheet(sheet_name)
-        _logger.info(f"Successfully retrieved sheet '{sheet_name}'.")
+        with _open_workbook(xl_file) as xl:
+            sheet_content = xl.read_sheet(sheet_name, nrows, skiprows)
+        _logger.info("Successfully retrieved sheet '%s'.", sheet_name)
         return sheet_content
     except Exception as e:
-        _logger.error(f"Error getting sheet by name '{sheet_name}' from {xl_file}: {e}")
+        _logger.error("Error getting sheet by name '%s' from %s: %s", sheet_name, xl_file, e)
+        raise
+
+
+def get_sheet_chunks(
+    xl_file: Union[str, bytes], sheet_name: str = None, chunksize: int = 10_000
+) -> Iterator[tuple[tuple[Union[str, float, int, bool, datetime, None], ...], ...]]:
+    """
+    Reads a sheet from an Excel file in chunks of rows.
+
+    This is a convenience function that wraps `ExcelWorkbook.iter_sheet`, so
+    memory use is bounded by the chunk size rather than the sheet size. The
+    file is opened when the first chunk is requested.
+
+    Args:
+        xl_file: Path to the Excel file or the file content as bytes.
+        sheet_name: The name of the sheet to read. Defaults to the first sheet.
+        chunksize: The maximum number of rows in each chunk.
+
+    Yields:
+        Tuples of at most `chunksize` rows.
+
+    Example:
+        >>> for rows in get_sheet_chunks('tests/test_xlsx_file.xlsx', 'Sheet1', chunksize=1000):
+        ...     df = pd.DataFrame(rows)
+    """
+    _logger.debug("Getting sheet '%s' in chunks from file: %s", sheet_name, xl_file)
+    try:
+        with _open_workbook(xl_file) as xl:
+            yield from xl.iter_sheet(sheet_name, chunksize)
+    except Exception as e:
+        _logger.error("Error getting sheet '%s' in chunks from %s: %s", sheet_name, xl_file, e)
         raise
 
 
+def _read_sheet_content(
+    xl_file: Union[str, bytes], sheet_name: str, nrows: Optional[int], skiprows: int
+) -> tuple[tuple[Union[str, float, int, bool, datetime, None], ...], ...]:
+    """Reads one sheet from its own workbook, as a worker of get_all_sheets."""
+    with ExcelWorkbook(xl_file) as xl:
+        return xl.read_sheet(sheet_name, nrows, skiprows)
+
+
+# Smallest workbook, in bytes, that get_all_sheets reads in worker processes
+_PARALLEL_MIN_SIZE = 1024 * 1024
+
+
+def _workbook_size(xl_file: Union[str, os.PathLike, bytes]) -> int:
+    """Returns the size in bytes of a workbook given by path or contents."""
+    if isinstance(xl_file, (str, os.PathLike)):
+        return os.path.getsize(xl_file)
+    return memoryview(xl_file).nbytes
+
+
 def get_all_sheets(
-    xl_file: Union[str, bytes]
+    xl_file: Union[str, bytes], parallelize: bool = False, workers: Optional[int] = None,
+    nrows: Optional[int] = None, skiprows: int = 0
 ) -> Dict[str, tuple[tuple[Union[str, float, int, bool, datetime, None], ...], ...]]:
     """
     Reads all sheets from an Excel file into a dictionary.
@@ -237,6 +524,15 @@ def get_all_sheets(
 
     Args:
         xl_file: Path to the Excel file or the file content as bytes.
+        parallelize: If True, reads the sheets in worker processes, each one
+            opening its own copy of the workbook. Worth it for workbooks with
+            several large sheets; workbooks with up to two sheets, or smaller
+            than 1 MB, are always read sequentially.
+        workers: The number of worker processes. Defaults to the number of
+            available CPUs, and is capped by the number of sheets.
+        nrows: The maximum number of rows to read from each sheet, as in
+            `ExcelWorkbook.read_sheet`.
+        skiprows: The number of rows to skip at the start of each sheet.
 
     Returns:
         A dictionary where keys are sheet names and values are sheet contents.
@@ -246,17 +542,25 @@ def get_all_sheets(
         >>> print(all_data.keys())
         dict_keys(['Sheet1', 'Sheet2'])
     """
-    _logger.debug(f"Getting all sheets from file: {xl_file}")
+    _logger.debug("Getting all sheets from file: %s", xl_file)
     try:
-        xl = ExcelWorkbook(xl_file)
-        sheet_names = xl.sheet_names
-        all_sheets_content = {
-            sheet_name: tuple(xl.read_sheet(sheet_name)) for sheet_name in sheet_names
-        }
-        _logger.info(f"Successfully retrieved all sheets from {xl_file}.")
+        with _open_workbook(xl_file) as xl:
+            sheet_names = xl.sheet_names
+            # Starting workers costs more than reading few or small sheets
+            parallelize = parallelize and len(sheet_names) > 2 and _workbook_size(xl_file) >= _PARALLEL_MIN_SIZE
+            if not parallelize:
+                all_sheets_content = {
+                    sheet_name: xl.read_sheet(sheet_name, nrows, skiprows) for sheet_name in sheet_names
+                }
+        if parallelize:
+            workers = min(workers or Process.get_available_cpu_count(), len(sheet_names))
+            with Process(_read_sheet_content, parallelize=True, workers=workers, parallel_type='processes') as runner:
+                contents = runner.run([(xl_file, sheet_name, nrows, skiprows) for sheet_name in sheet_names])
+            all_sheets_content = dict(zip(sheet_names, contents))
+        _logger.info("Successfully retrieved all sheets from %s.", xl_file)
         return all_sheets_content
     except Exception as e:
-        _logger.error(f"Error getting all sheets from {xl_file}: {e}")
+        _logger.error("Error getting all sheets from %s: %s", xl_file, e)
         raise
 
 
@@ -290,10 +594,10 @@ def write_to_sheet(
         >>> # Add a sheet with a name that already exists
         >>> write_to_sheet(df, 'output.xlsx', 'MyData') # Creates 'MyData1'
     """
-    _logger.debug(f"Writing DataFrame to Excel sheet '{sheet_name}' in workbook: {workbook_path}")
+    _logger.debug("Writing DataFrame to Excel sheet '%s' in workbook: %s", sheet_name, workbook_path)
     try:
         if not os.path.exists(workbook_path):
-            _logger.info(f"Workbook does not exist, creating new file: {workbook_path}")
+            _logger.info("Workbook does not exist, creating new file: %s", workbook_path)
             df.to_excel(
                 workbook_path,
                 sheet_name=sheet_name,
@@ -301,41 +605,39 @@ def write_to_sheet(
                 freeze_panes=(1, 0),
                 header=True,
             )
-            _logger.info(f"Successfully created new workbook and wrote sheet '{sheet_name}'.")
+            _logger.info("Successfully created new workbook and wrote sheet '%s'.", sheet_name)
         else:
-            _logger.info(f"Workbook exists, appending to: {workbook_path}")
-            warnings.simplefilter("ignore")
-            try:
-                # Use 'a' mode to append and 'if_sheet_exists' to handle conflicts.
-                # The 'new' option in modern pandas creates a new sheet with an indexed name.
-                # The manual check below is kept for robustness across pandas versions.
-                with pd.ExcelWriter(workbook_path, engine='openpyxl', mode='a', if_sheet_exists='new') as writer:
+            _logger.info("Workbook exists, appending to: %s", workbook_path)
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore")
+                try:
+                    # Use 'a' mode to append and 'if_sheet_exists' to handle conflicts.
+                    # The 'new' option in modern pandas creates a new sheet with an indexed name.
+                    # The manual check below is kept for robustness across pandas versions.
+                    with pd.ExcelWriter(workbook_path, engine='openpyxl', mode='a', if_sheet_exists='new') as writer:
                     
-                    # Ensure unique sheet name manually for broader compatibility
-                    temp_book = load_workbook(workbook_path)
-                    current_sheet_names = temp_book.sheetnames
-                    temp_book.close()
-
-                    final_sheet_name = sheet_name
-                    index = 0
-                    while final_sheet_name in current_sheet_names:
-                        index += 1
-                        final_sheet_name = f"{sheet_name}{index}"
+                        # Ensure unique sheet name manually for broader compatibility,
+                        # from the workbook the writer has already loaded
+                        current_sheet_names = set(writer.book.sheetnames)
+
+                        final_sheet_name = sheet_name
+                        index = 0
+                        while final_sheet_name in current_sheet_names:
+                            index += 1
+                            final_sheet_name = f"{sheet_name}{index}"
                     
-                    _logger.debug(f"Final sheet name determined: {final_sheet_name}")
-                    df.to_excel(
-                        writer,
-                        sheet_name=final_sheet_name,
-                        index=False,
-                        freeze_panes=(1, 0),
-                        header=True,
-                    )
-                _logger.info(f"Successfully wrote DataFrame to sheet '{final_sheet_name}' in existing workbook.")
-            except Exception as e:
-                _logger.error(f"Error writing to existing Excel workbook {workbook_path}: {e}")
-                raise
-            finally:
-                warnings.simplefilter("default")
+                        _logger.debug("Final sheet name determined: %s", final_sheet_name)
+                        df.to_excel(
+                            writer,
+                            sheet_name=final_sheet_name,
+                            index=False,
+                            freeze_panes=(1, 0),
+                            header=True,
+                        )
+                    _logger.info("Successfully wrote DataFrame to sheet '%s' in existing workbook.", final_sheet_name)
+                except Exception as e:
+                    _logger.error("Error writing to existing Excel workbook %s: %s", workbook_path, e)
+                    raise
     except Exception as e:
-        _logger.error(f"Critical error in write_to_sheet: {e}")
+        _logger.error("Critical error in write_to_sheet: %s", e)
         raise
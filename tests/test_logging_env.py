@@ -128,7 +128,7 @@ def test_env_initialization_with_config(mock_file_operations, mock_makedirs, moc
     assert os.path.normpath(env.LOG_FILE) == os.path.normpath("test_logs/test_app.log")
     assert os.path.normpath(env.USER_FOLDER) == os.path.normpath("/mock/home/user")
     assert os.path.normpath(env.USER_APP_FOLDER) == os.path.normpath(os.path.join("/mock/home/user", ".testapp"))
-    mock_makedirs.assert_called_with(env.USER_APP_FOLDER)
+    mock_makedirs.assert_called_with(env.USER_APP_FOLDER, exist_ok=True)
         
 def test_env_precedence_environment_variable_over_config(mock_file_operations, mock_makedirs, mock_path_exists_and_isdir, temp_app_json_content):
     mock_exists, mock_isdir, _existing_paths, _directory_paths = mock_path_exists_and_isdir
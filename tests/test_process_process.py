@@ -1,8 +1,12 @@
+import gc
 import os
 import time
 import pytest
 import tempfile
 import pickle
+import subprocess
+import sys
+import weakref
 import multiprocessing
 from unittest import mock
 from datetime import datetime, timedelta
@@ -61,3 +65,307 @@ def test_is_parallelizable(caplog):
     root_logger = logging.getLogger()
     root_logger.setLevel(logging.DEBUG)  # Set root logger level to DEBUG or INFO
     root_logger.addHandler(logging.StreamHandler())  # Add a basic handler
+
+@pytest.fixture
+def app_folder(tmp_path, monkeypatch):
+    """Redirects the process control files to a temporary folder."""
+    monkeypatch.setattr(process._env, 'USER_APP_FOLDER', str(tmp_path))
+    return tmp_path
+
+def test_session_process_controlled_run_resumes_session(app_folder):
+    session_process = process.SessionProcess(dummy_session_process_func, parallelize=False)
+    session_id = session_process.generate_session_id()
+    params = [(1, 'a'), (2, 'b')]
+
+    first_run = session_process.run(params, session_id=session_id, controlled=True)
+    assert [r[1] for r in first_run] == [True, True]
+    done_log = os.path.join(process.SessionProcess.get_session_control_folder(session_id), "done.log")
+    with open(done_log) as f:
+        assert len(f.read().splitlines()) == 2
+
+    second_run = session_process.run(params, session_id=session_id, controlled=True)
+    assert [r[2] for r in second_run] == ["Skipped", "Skipped"]
+    assert [r[0] for r in second_run] == [r[0] for r in first_run]
+
+def test_session_process_controlled_run_reads_legacy_task_markers(app_folder):
+    session_process = process.SessionProcess(dummy_session_process_func, parallelize=False)
+    session_id = session_process.generate_session_id()
+    # Marker of a completed task, as written by earlier versions
+    session_control_folder = os.path.join(str(app_folder), "session_control", f"s_{hash_string(session_id)}")
+    os.makedirs(session_control_folder)
+    legacy_task_id = f"task_{hash_string(str((1, 'a')))}"
+    open(os.path.join(session_control_folder, f"t_{hash_string(legacy_task_id)}.reg"), 'wb').close()
+
+    results = session_process.run([(1, 'a'), (2, 'b')], session_id=session_id, controlled=True)
+    assert [r[2] for r in results] == ["Skipped", None]
+
+def test_session_process_controlled_run_skips_malformed_done_log_lines(app_folder):
+    session_process = process.SessionProcess(dummy_session_process_func, parallelize=True, workers=1,
+                                             parallel_type='processes')
+    session_id = session_process.generate_session_id()
+    session_control_folder = process.SessionProcess.get_session_control_folder(session_id)
+    os.makedirs(session_control_folder)
+    task_key = process.SessionProcess.generate_task_id((1, 'a'))[len("task_"):]
+    with open(os.path.join(session_control_folder, "done.log"), 'wb') as done_log:
+        done_log.write(f"{task_key}\nnot-a-key\n{task_key[:10]}".encode('ascii'))
+    open(os.path.join(session_control_folder, "t_stray.reg"), 'wb').close()
+
+    results = session_process.run([(1, 'a'), (2, 'b')], session_id=session_id, controlled=True)
+    session_process.close()
+    assert [r[2] for r in results] == ["Skipped", None]
+
+def test_shared_task_index_membership():
+    task_keys = frozenset(hash_string(f"task_{i}") for i in range(10))
+    index = process._SharedTaskIndex(task_keys)
+    try:
+        assert len(index) == 10
+        assert all(k in index for k in task_keys)
+        assert hash_string("task_missing") not in index
+        # Workers receive only the block reference and attach on first lookup
+        attached = pickle.loads(pickle.dumps(index))
+        assert all(k in attached for k in task_keys)
+        # The attachment is released along with the copy
+        block = weakref.ref(attached._shm)
+        del attached
+        gc.collect()
+        assert block() is None
+    finally:
+        index.release()
+
+def test_session_process_accepts_process_result(app_folder):
+    def named_result_func(param):
+        return process.ProcessResult(True, None, param * 2)
+
+    session_process = process.SessionProcess(named_result_func, parallelize=False)
+    results = session_process.run([(1,), (2,)], controlled=True)
+    assert [r[1:] for r in results] == [(True, None, 2), (True, None, 4)]
+
+def test_process_run_with_chunksize():
+    runner = process.Process(dummy_process_func, parallelize=True, workers=1, parallel_type='processes')
+    results = runner.run([(i,) for i in range(5)], chunksize=2)
+    assert results == [(True, None, f"processed {i}") for i in range(5)]
+
+def reverse_bytes_func(data):
+    return True, None, bytearray(reversed(data))
+
+def test_process_run_processes_with_large_buffers():
+    data = bytearray(os.urandom(process._SHARED_BUFFERS_MIN_SIZE * 2))
+    wrapped = process._SharedBuffers.wrap((data,))
+    assert isinstance(wrapped, process._SharedBuffers)
+    assert process._SharedBuffers.unwrap(wrapped) == (data,)
+    runner = process.Process(reverse_bytes_func, parallelize=True, workers=1, parallel_type='processes')
+    results = runner.run([(data,), (bytearray(b'abc'),)])
+    assert results == [(True, None, bytearray(reversed(data))), (True, None, bytearray(b'cba'))]
+
+def failing_buffer_func(data, fail):
+    if fail:
+        raise ValueError("failed")
+    return True, None, data
+
+@pytest.mark.skipif(not os.path.isdir('/dev/shm'), reason="needs POSIX shared memory")
+def test_process_run_processes_releases_buffers_on_error():
+    data = bytearray(process._SHARED_BUFFERS_MIN_SIZE * 2)
+    before = set(os.listdir('/dev/shm'))
+    with process.Process(failing_buffer_func, parallelize=True, workers=1, parallel_type='processes') as runner:
+        with pytest.raises(ValueError, match="failed"):
+            runner.run([(data, i == 1) for i in range(6)], chunksize=2)
+        with pytest.raises(ValueError, match="failed"):
+            list(runner.run_iter((data, i == 1) for i in range(6)))
+    assert set(os.listdir('/dev/shm')) <= before
+
+@pytest.mark.skipif(os.name != 'posix', reason="shared memory buffers are POSIX only")
+def test_process_run_processes_does_not_leak_tracked_buffers(tmp_path):
+    # Only the results are large, so shared memory is first used by the workers. The resource
+    # tracker reports leaks when the interpreter exits, so the run goes in a child process
+    script = tmp_path / "large_buffers.py"
+    script.write_text(
+        "import fbpyutils\n"
+        "fbpyutils.setup()\n"
+        "from fbpyutils import process\n"
+        "def make_bytes(size):\n"
+        "    return True, None, bytes(size)\n"
+        "if __name__ == '__main__':\n"
+        "    size = process._SHARED_BUFFERS_MIN_SIZE * 2\n"
+        "    with process.Process(make_bytes, parallelize=True, workers=1, parallel_type='processes') as runner:\n"
+        "        assert runner.run([(size,)] * 4) == [(True, None, bytes(size))] * 4\n"
+    )
+    root = os.path.dirname(os.path.dirname(os.path.abspath(process.__file__)))
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [root, os.environ.get('PYTHONPATH')])))
+    completed = subprocess.run([sys.executable, str(script)], capture_output=True, text=True, env=env, cwd=tmp_path, timeout=120)
+    assert completed.returncode == 0, completed.stderr
+    assert "resource_tracker" not in completed.stderr
+
+def test_file_process_controlled_run_skips_unmodified_files(app_folder, tmp_path):
+    files = []
+    for i in range(3):
+        f = tmp_path / f"file_{i}.txt"
+        f.write_text(str(i))
+        files.append((str(f),))
+    file_process = process.FileProcess(dummy_file_process_func, parallelize=False)
+
+    first_run = file_process.run(files, controlled=True)
+    assert [r[1:3] for r in first_run] == [(True, None)] * 3
+    assert (app_folder / "process_control.db").exists()
+
+    # Touch one file into the future so it counts as modified
+    future = time.time() + 60
+    os.utime(files[1][0], (future, future))
+    second_run = file_process.run(files, controlled=True)
+    assert [r[2] for r in second_run] == ["Skipped", None, "Skipped"]
+    assert second_run[1] == (files[1][0], True, None, f"processed {files[1][0]}")
+
+def test_file_process_controlled_run_records_progress_on_error(app_folder, tmp_path):
+    processed = tmp_path / "processed.txt"
+    processed.write_text("x")
+    file_process = process.FileProcess(dummy_file_process_func, parallelize=True, workers=1)
+    with pytest.raises(FileNotFoundError):
+        file_process.run([(str(processed),), (str(tmp_path / "missing.txt"),)], controlled=True)
+    file_process.close()
+    assert file_process.run([(str(processed),)], controlled=True)[0][2] == "Skipped"
+
+def test_file_process_controlled_run_reads_legacy_control_files(app_folder, tmp_path):
+    f = tmp_path / "file.txt"
+    f.write_text("x")
+    # A timestamp finer than a microsecond, as recorded by most file systems
+    os.utime(f, ns=(1_700_000_000_123_456_321, 1_700_000_000_123_456_321))
+    function_ref = process.Process.get_function_info(dummy_file_process_func)['full_ref']
+    control_folder = app_folder / f"p_{hash_string(function_ref)}.control"
+    control_folder.mkdir()
+    # Legacy control files hold the creation date of the file when it was processed
+    with open(control_folder / f"f_{hash_string(str(f))}.reg", 'wb') as cf:
+        pickle.dump(creation_date(str(f)).timestamp(), cf)
+    file_process = process.FileProcess(dummy_file_process_func, parallelize=False)
+    assert file_process.run([(str(f),)], controlled=True)[0][2] == "Skipped"
+    # The timestamp now lives in the control database
+    (control_folder / f"f_{hash_string(str(f))}.reg").unlink()
+    assert file_process.run([(str(f),)], controlled=True)[0][2] == "Skipped"
+
+def test_session_process_generate_task_id():
+    task_id = process.SessionProcess.generate_task_id((1, "a"))
+    assert task_id == process.SessionProcess.generate_task_id((1, "a"))
+    assert task_id != process.SessionProcess.generate_task_id((1, "b"))
+    assert task_id.startswith("task_") and len(task_id) == len("task_") + 32
+
+def test_get_function_info():
+    info = process.Process.get_function_info(dummy_process_func)
+    assert info['full_ref'] == f"{__name__}.dummy_process_func"
+    assert info['unique_ref'] == f"{__name__}.dummy_process_func_{id(dummy_process_func)}"
+    # Callers get their own copy of the cached information
+    info['name'] = 'changed'
+    assert process.Process.get_function_info(dummy_process_func)['name'] == 'dummy_process_func'
+
+@pytest.mark.parametrize("parallelize, parallel_type", [(False, 'threads'), (True, 'threads'), (True, 'processes')])
+def test_process_run_iter(parallelize, parallel_type):
+    runner = process.Process(dummy_process_func, parallelize=parallelize, workers=1, parallel_type=parallel_type)
+    results = runner.run_iter((i,) for i in range(5))
+    assert sorted(r[2] for r in results) == [f"processed {i}" for i in range(5)]
+
+def test_process_run_iter_early_close():
+    data = bytearray(process._SHARED_BUFFERS_MIN_SIZE)
+    runner = process.Process(reverse_bytes_func, parallelize=True, workers=1, parallel_type='processes')
+    results = runner.run_iter((data,) for _ in range(10))
+    assert next(results)[0] is True
+    results.close()
+
+def test_process_reuses_executor_across_runs():
+    with process.Process(dummy_process_func, parallelize=True, workers=1) as runner:
+        runner.run([(1,)])
+        executor = runner._executor
+        assert executor is not None
+        assert runner.run([(2,)]) == [(True, None, "processed 2")]
+        assert runner._executor is executor
+        assert pickle.loads(pickle.dumps(runner))._executor is None
+    assert runner._executor is None
+    assert runner.run([(3,)]) == [(True, None, "processed 3")]
+    runner.close()
+
+def test_file_process_file_timestamps(tmp_path):
+    f = tmp_path / "file.txt"
+    f.write_text("x")
+    os.utime(f, ns=(1_700_000_000_123_456_321, 1_700_000_000_123_456_321))
+    timestamps = process.FileProcess._file_timestamps([str(f), str(tmp_path / "missing.txt"), "/nonexistent/file.txt"])
+    assert list(timestamps) == [str(f)]
+    assert timestamps[str(f)] == creation_date(str(f)).timestamp()
+
+@pytest.mark.parametrize("os_name", [os.name, 'nt'])
+def test_file_process_file_timestamps_non_normalized_paths(tmp_path, monkeypatch, os_name):
+    f = tmp_path / "file.txt"
+    f.write_text("x")
+    monkeypatch.chdir(tmp_path)
+    paths = [f"{tmp_path}//file.txt", os.path.join(str(tmp_path), ".", "file.txt"), "file.txt"]
+    # 'nt' runs the directory scan used on Windows
+    monkeypatch.setattr(process.os, 'name', os_name)
+    timestamps = process.FileProcess._file_timestamps(paths + [str(tmp_path / "missing.txt")])
+    monkeypatch.undo()
+    assert list(timestamps) == paths
+    assert len(set(timestamps.values())) == 1
+
+def large_bytes_func(size):
+    return True, None, b'x' * size
+
+def test_process_run_processes_with_large_bytes_results():
+    size = process._SHARED_BUFFERS_MIN_SIZE * 2
+    runner = process.Process(large_bytes_func, parallelize=True, workers=1, parallel_type='processes')
+    results = runner.run([(size,), (3,)])
+    assert results == [(True, None, b'x' * size), (True, None, b'xxx')]
+    assert type(results[0][2]) is bytes
+    runner.close()
+
+@pytest.mark.skipif(not os.path.isdir('/dev/shm'), reason="needs POSIX shared memory")
+def test_shared_buffers_discard():
+    wrapped = process._SharedBuffers.wrap((b'x' * process._SHARED_BUFFERS_MIN_SIZE,))
+    assert wrapped._name.lstrip('/') in os.listdir('/dev/shm')
+    process._SharedBuffers.discard(wrapped)
+    assert wrapped._name.lstrip('/') not in os.listdir('/dev/shm')
+    process._SharedBuffers.discard((True, None, b'small'))
+
+def test_session_process_controlled_run_keeps_process_function(app_folder):
+    seen = []
+
+    def record_process_func(param):
+        seen.append(session_process._process)
+        return True, None, param
+
+    session_process = process.SessionProcess(record_process_func, parallelize=False)
+    session_process.run([(1,)], controlled=True)
+    assert seen == [record_process_func]
+
+def test_is_parallelizable_types():
+    assert process.Process.is_parallelizable('threads') is True
+    assert process.Process.is_parallelizable('processes') is True
+    assert process.Process.is_parallelizable('unknown') is False
+
+
+def test_done_log_batches_writes(tmp_path):
+    path = str(tmp_path / "done.log")
+    done_log = process._DoneLog(path)
+    for i in range(process._DONE_LOG_BATCH_SIZE - 1):
+        done_log.append(f"key{i}")
+    assert os.path.getsize(path) == 0
+    done_log.append("last")
+    assert len(open(path, 'rb').read().splitlines()) == process._DONE_LOG_BATCH_SIZE
+    done_log.append("pending")
+    done_log.close()
+    assert open(path, 'rb').read().splitlines()[-1] == b"pending"
+
+def test_session_process_controlled_run_in_processes_resumes_session(app_folder):
+    with process.SessionProcess(dummy_session_process_func, parallelize=True, workers=1,
+                                parallel_type='processes') as session_process:
+        session_id = session_process.generate_session_id()
+        params = [(1, 'a'), (2, 'b')]
+        assert [r[1] for r in session_process.run(params, session_id=session_id, controlled=True)] == [True, True]
+        second_run = session_process.run(params, session_id=session_id, controlled=True)
+        assert [r[2] for r in second_run] == ["Skipped", "Skipped"]
+
+def test_session_process_mark_done_without_handle(tmp_path):
+    process.SessionProcess._mark_done(str(tmp_path), "key1", None)
+    process.SessionProcess._mark_done(str(tmp_path), "key2", None)
+    assert (tmp_path / "done.log").read_bytes() == b"key1\nkey2\n"
+
+def test_process_errors_logged_with_traceback_once(app_folder, tmp_path):
+    file_process = process.FileProcess(dummy_file_process_func, parallelize=True, workers=1)
+    with mock.patch.object(process, '_logger') as logger, pytest.raises(FileNotFoundError):
+        file_process.run([(str(tmp_path / "missing.txt"),)], controlled=True)
+    file_process.close()
+    logged = logger.error.call_args_list + logger.critical.call_args_list
+    assert sum(bool(c.kwargs.get('exc_info')) for c in logged) == 1
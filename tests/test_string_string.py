@@ -8,6 +8,11 @@ def test_uuid():
     assert len(u) == 36  # UUID padrão tem 36 caracteres
 
 
+def test_uuid_compact():
+    u = string.uuid(compact=True)
+    assert len(u) == 32 and "-" not in u
+
+
 def test_similarity_same_strings():
     sim = string.similarity("hello", "hello")
     assert sim == 1.0
@@ -45,6 +50,12 @@ def test_random_string_no_digits():
     assert not any(char.isdigit() for char in random_str)
 
 
+def test_random_string_secure():
+    random_str = string.random_string(x=64, include_digits=False, secure=True)
+    assert len(random_str) == 64
+    assert random_str.isalpha()
+
+
 def test_random_string_special_chars():
     random_str = string.random_string(include_special=True)
     assert any(char in "!@#$%^&amp;*_" for char in random_str)
@@ -63,6 +74,13 @@ def test_hash_string():
     assert len(hash_str) == 32  # MD5 hash tem 32 caracteres hexadecimais
 
 
+def test_hash_string_algorithms():
+    assert string.hash_string("test string") == "6f8db599de986fab7a21625b7916589c"
+    blake = string.hash_string("test string", algorithm="blake2b")
+    assert len(blake) == 32 and blake != string.hash_string("test string")
+    assert len(string.hash_string("test string", algorithm="sha256")) == 64
+
+
 def test_hash_json():
     data = {"name": "Test", "value": 123}
     hash_json_str = string.hash_json(data)
@@ -83,6 +101,8 @@ def test_normalize_value_custom_size_decimal():
 def test_translate_special_chars():
     translated_string = string.translate_special_chars("áéíóúçãõ")
     assert translated_string == "aeioucao"
+    assert string.translate_special_chars("plain ascii") == "plain ascii"
+    assert string.translate_special_chars(None) == ""
 
 
 def test_normalize_names_default():
@@ -112,3 +132,62 @@ def test_split_by_lengths_long_string():
     lengths = [4, 2, 5, 7, 5]
     substrings = string.split_by_lengths(long_string, lengths)
     assert substrings == ["This", "Is", "ALong", "StringF", "orTes"]
+
+
+def test_isplit_by_lengths():
+    lengths = [4, 2, 0, 5, 30, 5]
+    pieces = string.isplit_by_lengths("ThisIsALongStringForTest", iter(lengths))
+    assert next(pieces) == "This"
+    assert list(pieces) == string.split_by_lengths("ThisIsALongStringForTest", lengths)[1:]
+
+
+def test_similarity_reuses_prepared_strings():
+    string._similarity_text.cache_clear()
+    for other in ("Hello  World", "hello world", "HELLO   WORLD"):
+        assert string.similarity("Hello World", other) == 1.0
+    assert string._similarity_text.cache_info().hits == 2
+
+
+def test_hash_json_sort_keys():
+    data = {"name": "Test", "value": 123}
+    reordered = {"value": 123, "name": "Test"}
+    assert string.hash_json(data) == string.hash_string(string.json_string(data))
+    assert string.hash_json(data) != string.hash_json(reordered)
+    assert string.hash_json(data, sort_keys=True) == string.hash_json(reordered, sort_keys=True)
+
+
+def test_similarity_min_ratio():
+    ratio = string.similarity("hello world", "hello there")
+    assert string.similarity("hello world", "hello there", min_ratio=ratio) == ratio
+    assert string.similarity("hello world", "hello there", min_ratio=ratio + 0.01) == 0.0
+    assert string.similarity("a", "a much longer string", min_ratio=0.5) == 0.0
+    assert string.similarity("Hello", "hello", min_ratio=0.9) == 1.0
+
+
+def test_hash_strings():
+    values = ["a", "b", "ção"]
+    assert string.hash_strings(values) == [string.hash_string(v) for v in values]
+    assert string.hash_strings(values, "blake2b") == [string.hash_string(v, "blake2b") for v in values]
+    assert string.hash_strings(iter(values), "sha1") == [string.hash_string(v, "sha1") for v in values]
+
+
+def test_hash_string_bytes():
+    assert string.hash_string("ção".encode("utf-8")) == string.hash_string("ção")
+    assert string.hash_strings([b"a", "a"], "blake2b") == [string.hash_string("a", "blake2b")] * 2
+
+
+def test_normalize_names_cache():
+    string._normalized_name.cache_clear()
+    names = ["Ação Nome", "Valor/Total", "Ação Nome"]
+    assert string.normalize_names(names) == ["acao_nome", "valor_total", "acao_nome"]
+    assert string.normalize_names(names) == ["acao_nome", "valor_total", "acao_nome"]
+    assert string._normalized_name.cache_info().hits == 4
+
+
+def test_similarity_scorer():
+    candidates = ["hello  world", "help", "Hallo Welt", ""]
+    scorer = string.SimilarityScorer("Hello World")
+    assert [scorer.score(c) for c in candidates] == [string.similarity(c, "Hello World") for c in candidates]
+    strict = string.SimilarityScorer("Hello World", min_ratio=0.9)
+    assert strict.score("help") == 0.0
+    assert strict.score("hello world") == 1.0
@@ -100,6 +100,31 @@ def test_excel_workbook_constructor_xls():
         # Check that openpyxl.open was called before xlrd.open_workbook
         assert mock_openpyxl_open.called
 
+def test_excel_workbook_constructor_xls_path(tmp_path):
+    # Test that XLS files given by path are opened by xlrd from the file itself
+    xls_path = str(tmp_path / "dummy.xls")
+    with open(xls_path, 'wb') as f:
+        f.write(b"dummy xls content")
+    with patch('xlrd.open_workbook') as mock_xlrd_open_workbook:
+        mock_xlrd_open_workbook.return_value.sheet_names.return_value = ['Sheet1_xls']
+        workbook = ExcelWorkbook(xls_path)
+        assert workbook.kind == XLS
+        mock_xlrd_open_workbook.assert_called_once_with(filename=xls_path, on_demand=True)
+        assert workbook._file is None
+
+def test_excel_workbook_constructor_xls_signature():
+    # Test that OLE2 (XLS) contents go straight to xlrd
+    xls_content = b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1' + b"dummy xls content"
+    with patch('xlrd.open_workbook') as mock_xlrd_open_workbook, \
+         patch('openpyxl.open') as mock_openpyxl_open:
+        mock_xlrd_open_workbook.return_value.sheet_names.return_value = ['Sheet1_xls']
+        workbook = ExcelWorkbook(xls_content)
+        assert workbook.kind == XLS
+        mock_xlrd_open_workbook.assert_called_once_with(
+            file_contents=xls_content, on_demand=True
+        )
+        assert not mock_openpyxl_open.called
+
 def test_excel_workbook_read_sheet_invalid_name_xlsx():
     # Test read_sheet with an invalid sheet name for XLSX
     workbook = ExcelWorkbook('tests/test_xlsx_file.xlsx')
@@ -253,3 +278,143 @@ def test_write_to_sheet_empty_dataframe_xlsx():
     finally:
         if os.path.exists(workbook_path):
             os.remove(workbook_path)
+
+def test_excel_workbook_close_xlsx():
+    # Test that a workbook opened from a path releases its file
+    with ExcelWorkbook('tests/test_xlsx_file.xlsx') as workbook:
+        assert workbook._file is not None
+        sheet_content = workbook.read_sheet()
+    assert workbook._file is None
+    with open('tests/test_xlsx_file.xlsx', 'rb') as f:
+        assert sheet_content == ExcelWorkbook(f.read()).read_sheet()
+
+def test_excel_workbook_read_sheet_sizes_rows_from_cells_xlsx(tmp_path):
+    # Test that sheets are sized from their cells, not the declared dimensions
+    from openpyxl import Workbook as OpenpyxlWorkbook
+    workbook_path = str(tmp_path / "sized.xlsx")
+    wb = OpenpyxlWorkbook()
+    wb.active['A1'] = 'a'
+    wb.active['C3'] = 3
+    wb.save(workbook_path)
+    with ExcelWorkbook(workbook_path) as workbook:
+        assert workbook.read_sheet() == (('a', None, None), (None, None, None), (None, None, 3))
+
+def test_get_all_sheets_parallelize_xlsx(tmp_path):
+    # Test that sheets read by worker processes match a sequential read
+    from openpyxl import Workbook as OpenpyxlWorkbook
+    from fbpyutils.xlsx import get_all_sheets, Process
+    workbook_path = str(tmp_path / "sheets.xlsx")
+    wb = OpenpyxlWorkbook()
+    for i in range(3):
+        wb.create_sheet(f"Data{i}").append([i, f"value{i}", None, i * 1.5])
+    wb.save(workbook_path)
+    expected = get_all_sheets(workbook_path)
+    assert list(expected) == ["Sheet", "Data0", "Data1", "Data2"]
+    with patch('fbpyutils.xlsx.Process', wraps=Process) as mock_process:
+        # Small workbooks are read sequentially
+        assert get_all_sheets(workbook_path, parallelize=True, workers=2) == expected
+        assert not mock_process.called
+        with patch('fbpyutils.xlsx._PARALLEL_MIN_SIZE', 0):
+            assert get_all_sheets(workbook_path, parallelize=True, workers=2) == expected
+            with open(workbook_path, 'rb') as f:
+                assert get_all_sheets(f.read(), parallelize=True, workers=2) == expected
+        assert mock_process.call_count == 2
+
+def test_excel_workbook_keeps_warning_filters_xlsx():
+    # Test that opening a workbook does not replace the caller's warning filters
+    import warnings
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        filters = list(warnings.filters)
+        ExcelWorkbook('tests/test_xlsx_file.xlsx').close()
+        assert warnings.filters == filters
+
+def test_excel_workbook_iter_sheet_xlsx(tmp_path):
+    # Test that a sheet read in chunks gives the same rows as read_sheet
+    from openpyxl import Workbook as OpenpyxlWorkbook
+    workbook_path = str(tmp_path / "chunks.xlsx")
+    wb = OpenpyxlWorkbook()
+    for i in range(25):
+        wb.active.append([i, f"value{i}", i * 1.5])
+    wb.save(workbook_path)
+    with ExcelWorkbook(workbook_path) as workbook:
+        chunks = list(workbook.iter_sheet(chunksize=10))
+        assert [len(c) for c in chunks] == [10, 10, 5]
+        assert sum(chunks, ()) == workbook.read_sheet()
+        with pytest.raises(NameError):
+            workbook.iter_sheet('NonExistentSheet')
+    from fbpyutils.xlsx import get_sheet_chunks
+    assert list(get_sheet_chunks(workbook_path, chunksize=10)) == chunks
+    with pytest.raises(NameError):
+        next(get_sheet_chunks(workbook_path, 'NonExistentSheet'))
+
+def test_excel_workbook_constructor_path_like_and_bytearray_xlsx():
+    # Test constructor with a pathlib.Path and with a bytearray
+    from pathlib import Path
+    with ExcelWorkbook(Path('tests/test_xlsx_file.xlsx')) as workbook:
+        expected = workbook.read_sheet()
+    with open('tests/test_xlsx_file.xlsx', 'rb') as f:
+        assert ExcelWorkbook(bytearray(f.read())).read_sheet() == expected
+    with pytest.raises(FileNotFoundError):
+        ExcelWorkbook(Path('tests'))
+
+def test_excel_workbook_read_sheet_nrows_skiprows_xlsx(tmp_path):
+    # Test reading a slice of the rows of a sheet
+    from openpyxl import Workbook as OpenpyxlWorkbook
+    from fbpyutils.xlsx import get_sheet_by_name, get_all_sheets
+    workbook_path = str(tmp_path / "rows.xlsx")
+    wb = OpenpyxlWorkbook()
+    for i in range(10):
+        wb.active.append([i, f"value{i}"])
+    wb.save(workbook_path)
+    with ExcelWorkbook(workbook_path) as workbook:
+        rows = workbook.read_sheet()
+        assert workbook.read_sheet(nrows=3) == rows[:3]
+        assert workbook.read_sheet(nrows=3, skiprows=8) == rows[8:]
+        assert workbook.read_sheet(skiprows=2) == rows[2:]
+    assert get_sheet_by_name(workbook_path, 'Sheet', nrows=2, skiprows=1) == rows[1:3]
+    assert get_all_sheets(workbook_path, nrows=1) == {'Sheet': rows[:1]}
+
+def test_workbook_cache_xlsx(tmp_path):
+    # Test that module functions read a workbook file once until it changes
+    import pandas as pd
+    from fbpyutils import xlsx
+    workbook_path = str(tmp_path / "cached.xlsx")
+    xlsx.write_to_sheet(pd.DataFrame({'col1': [1, 2]}), workbook_path, 'First')
+    with patch('fbpyutils.xlsx.open', wraps=open, create=True) as mock_open:
+        names = xlsx.get_sheet_names(workbook_path)
+        assert names == ['First']
+        names.append('Changed')
+        assert xlsx.get_sheet_names(workbook_path) == ['First']
+        assert xlsx.get_sheet_by_name(workbook_path, 'First') == (('col1',), (1,), (2,))
+        assert mock_open.call_count == 1
+        xlsx.write_to_sheet(pd.DataFrame({'col1': [3]}), workbook_path, 'Second')
+        assert xlsx.get_sheet_names(workbook_path) == ['First', 'Second']
+        assert mock_open.call_count == 2
+        assert [k[0] for k in xlsx._workbook_cache].count(os.path.abspath(workbook_path)) == 1
+        xlsx.clear_workbook_cache()
+        xlsx.get_sheet_names(workbook_path)
+        assert mock_open.call_count == 3
+    xlsx.clear_workbook_cache(workbook_path)
+    assert os.path.abspath(workbook_path) not in [k[0] for k in xlsx._workbook_cache]
+
+def test_workbook_cache_holds_no_files(tmp_path):
+    # Test that cached workbooks keep no file open and are not shared between calls
+    import shutil
+    from fbpyutils import xlsx
+    paths = [str(tmp_path / f"cached_{i}.xlsx") for i in range(2)]
+    for path in paths:
+        shutil.copy('tests/test_xlsx_file.xlsx', path)
+    with patch('fbpyutils.xlsx._WORKBOOK_CACHE_SIZE', 1):
+        rows = xlsx.get_sheet_by_name(paths[0], xlsx.get_sheet_names(paths[0])[0])
+        with xlsx._open_workbook(paths[0]) as first, xlsx._open_workbook(paths[0]) as second:
+            assert first is not second
+            assert first._file is None and second._file is None
+            assert first.read_sheet() == second.read_sheet() == rows
+        # The file can be replaced while its contents are cached
+        os.replace(paths[1], paths[0])
+        assert xlsx.get_sheet_by_name(paths[0], xlsx.get_sheet_names(paths[0])[0]) == rows
+    with patch('fbpyutils.xlsx._WORKBOOK_CACHE_MAX_FILE_SIZE', 0):
+        xlsx.clear_workbook_cache(paths[0])
+        xlsx.get_sheet_names(paths[0])
+        assert os.path.abspath(paths[0]) not in [k[0] for k in xlsx._workbook_cache]